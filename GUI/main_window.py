@@ -1,26 +1,17 @@
 import tkinter as tk
-from tkinter import font, messagebox
+from tkinter import font, messagebox, ttk
 import random
 import json
 import os
 import datetime
 
-import multiprocessing
-import queue
-from tools.question_generator import QuestionGenerator
+from tools.generator_pool import GeneratorPool
+from tools.question_prefetcher import QuestionPrefetcher
+from tools.fingerprint import BloomFilter, SeenInstances
 
-# --- FUNCȚIE WORKER PENTRU PROCES SEPARAT ---
-def generation_process_worker(result_queue, resources_path, category):
-    try:
-        gen = QuestionGenerator(resources_path)
-        res = gen.generate_random_question(specific_category=category)
-        result_queue.put(res)
-    except Exception as e:
-        result_queue.put(f"ERROR: {str(e)}")
-# ---------------------------------------------
 
 class Ui_main_window:
-    def __init__(self, generator=None, nlp_qa=None):
+    def __init__(self, nlp_qa=None):
         self.root = tk.Tk()
         self.root.geometry('1280x720')
         self.root.resizable(False, False)
@@ -38,13 +29,23 @@ class Ui_main_window:
         self.root.configure(bg=self.bg_dark)
 
         # Raw Data
-        self.generator = generator
         self.nlp_qa = nlp_qa
 
         # Variables for test history
         self.resources_path = os.path.join(os.getcwd(), 'resources')
         self.history_file = os.path.join(self.resources_path, 'history.json')
 
+        # Worker processes are started once and reused for every question; they share one solver cache
+        # and size the instances so that 99% of the questions are generated within 200 ms
+        self.generator_pool = GeneratorPool(self.resources_path, task_timeout=1.0,
+                                            solver_cache_path=os.path.join(self.resources_path, 'solver_cache.sqlite3'),
+                                            target_latency=0.2,
+                                            cost_model_path=os.path.join(self.resources_path, 'cost_model.json'))
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        # Instances shown in earlier sessions, kept as a Bloom filter of fingerprints
+        self.seen_filter = BloomFilter.open(os.path.join(self.resources_path, 'seen_questions.bloom'))
+
         #Variables for configuring test
         self.num_questions_var = tk.IntVar(value=10)
         self.cat_strategy = tk.BooleanVar(value=True)
@@ -56,7 +57,7 @@ class Ui_main_window:
         self.display_questions = []
         self.user_answers = []
         self.shuffled_options = []
-        self.seen_texts = set()
+        self.seen = SeenInstances(self.seen_filter)
 
         self.mc_var = tk.StringVar()
         self.mc_buttons = []
@@ -64,6 +65,10 @@ class Ui_main_window:
         self.current_question_idx = 0
         self.target_total_questions = 10
         self.active_categories = []
+        self.prefetcher = None
+        self.prefetch_size = 3
+        self.poll_interval_ms = 50
+        self._poll_job = None
 
         # Fonts
         self.title_font = font.Font(family="Segoe UI", size=32, weight="bold")
@@ -114,6 +119,7 @@ class Ui_main_window:
 
     def clear_screen(self):
         """Clears the main container for the next view."""
+        self._cancel_generation_poll()
         for widget in self.main_container.winfo_children():
             widget.destroy()
 
@@ -172,83 +178,76 @@ class Ui_main_window:
         create_chk("CSP (Logic, Forward Checking)", self.cat_csp)
         create_chk("MinMax & Alpha-Beta", self.cat_minmax)
 
-        tk.Button(right_frame, text='START QUIZ ►', font=("Segoe UI", 14, "bold"),
-                  bg=self.accent_blue, fg='white', padx=40, pady=15,
-                  activebackground='#2563eb', activeforeground='white',
-                  command=self.start_quiz, cursor='hand2', bd=0).pack(pady=40, anchor='w')
+        self.start_btn = tk.Button(right_frame, text='START QUIZ ►', font=("Segoe UI", 14, "bold"),
+                                   bg=self.accent_blue, fg='white', padx=40, pady=15,
+                                   activebackground='#2563eb', activeforeground='white',
+                                   command=self.start_quiz, cursor='hand2', bd=0)
+        self.start_btn.pack(pady=(40, 10), anchor='w')
+
+        self._create_progress_indicator(right_frame, "Generating questions...")
+        self.progress_place = {'x': 0, 'rely': 1.0, 'anchor': 'sw'}
+
+    def _create_progress_indicator(self, parent, text):
+        """Bară 'indeterminate' afișată cât timp așteptăm generarea (fereastra nu mai îngheață)."""
+        self.progress_frame = tk.Frame(parent, bg=parent.cget('bg'))
+        tk.Label(self.progress_frame, text=text, font=("Segoe UI", 11),
+                 bg=parent.cget('bg'), fg=self.text_muted).pack(side='left', padx=(0, 10))
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode='indeterminate', length=160)
+        self.progress_bar.pack(side='left')
+
+    def _show_progress(self, active):
+        if active:
+            self.progress_frame.place(**self.progress_place)
+            self.progress_bar.start(15)
+        else:
+            self.progress_bar.stop()
+            self.progress_frame.place_forget()
 
-    def _generate_with_timeout(self, category, timeout=1.0):  # Timeout mic (ex: 1.0 sec)
+    def _generate_next_question(self):
+        """Ia următoarea întrebare din buffer-ul de prefetch, fără să aștepte."""
+        if self.prefetcher is None:
+            return False
+
+        item = self.prefetcher.pop()
+        if item is None:
+            return False
+
+        # Marcată ca văzută abia acum, când e afișată; cele rămase în buffer nu sunt consumate
+        q_data, key = item
+        self.seen.add_if_new(key)
+        self.display_questions.append(q_data)
+        self.user_answers.append(None)
+        self.shuffled_options.append(None)
+        return True
+
+    def _request_question(self, on_ready, on_fail):
         """
-        Lansează un PROCES separat. Dacă expiră timpul, îl OMORÂM (terminate).
+        Cere următoarea întrebare fără să blocheze mainloop-ul.
+        Dacă buffer-ul e gol, verificăm din nou cu root.after până când un worker termină.
         """
-        # Folosim Queue din multiprocessing
-        result_queue = multiprocessing.Queue()
-
-        # Creăm procesul
-        # Îi trimitem calea către resurse ca să își facă propriul generator
-        p = multiprocessing.Process(
-            target=generation_process_worker,
-            args=(result_queue, self.resources_path, category)
-        )
-
-        p.start()
-
-        # Așteptăm să termine timp de 'timeout' secunde
-        p.join(timeout)
-
-        if p.is_alive():
-            # AICI E CHEIA: Dacă încă trăiește după 1 secundă, îl omorâm forțat!
-            # Asta eliberează instant procesorul.
-            p.terminate()
-            p.join()  # Curățăm resursele după el
-            print(f"💀 Process killed for category '{category}' (Timeout)")
-            return None
-
-        # Verificăm dacă a pus ceva în coadă
-        if not result_queue.empty():
-            res = result_queue.get()
-            # Verificăm dacă a returnat o eroare
-            if isinstance(res, str) and res.startswith("ERROR:"):
-                print(res)
-                return None
-            return res
-
-        return None
-
-    def _generate_next_question(self):
-        attempts = 0
-        max_attempts = 15
-
-        while attempts < max_attempts:
-            attempts += 1
-            if not self.active_categories: break
-
-            chosen_cat = random.choice(self.active_categories)
-
-            try:
-                q_data = self._generate_with_timeout(chosen_cat, timeout=1.0)
-
-                if q_data is None:
-                    continue
-
-                if len(q_data) == 3:
-                    final_q = (q_data[0], q_data[1], q_data[2], "No explanation provided.")
-                else:
-                    final_q = q_data
+        if self._generate_next_question():
+            on_ready()
+            return
 
-                if final_q[0] not in self.seen_texts:
-                    self.seen_texts.add(final_q[0])
+        self._show_progress(True)
+        self._poll_job = self.root.after(self.poll_interval_ms, self._poll_generation, on_ready, on_fail)
 
-                    self.display_questions.append(final_q)
-                    self.user_answers.append(None)
-                    self.shuffled_options.append(None)
-                    return True
+    def _poll_generation(self, on_ready, on_fail):
+        self._poll_job = None
 
-            except Exception as e:
-                print(f"Gen Error in loop: {e}")
-                continue
+        if self._generate_next_question():
+            self._show_progress(False)
+            on_ready()
+        elif self.prefetcher is None or self.prefetcher.exhausted:
+            self._show_progress(False)
+            on_fail()
+        else:
+            self._poll_job = self.root.after(self.poll_interval_ms, self._poll_generation, on_ready, on_fail)
 
-        return False
+    def _cancel_generation_poll(self):
+        if self._poll_job is not None:
+            self.root.after_cancel(self._poll_job)
+            self._poll_job = None
 
     def start_quiz(self):
         self.active_categories = []
@@ -269,16 +268,27 @@ class Ui_main_window:
         self.display_questions = []
         self.user_answers = []
         self.shuffled_options = []
-        self.seen_texts = set()
+        self.seen = SeenInstances(self.seen_filter)
         self.current_question_idx = 0
 
-        success = self._generate_next_question()
-        if not success:
-             messagebox.showerror("Error", "Could not generate initial question.")
-             return
+        # Questions for the whole quiz are produced in the background, K at a time
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        self.prefetcher = QuestionPrefetcher(
+            self.generator_pool, self.active_categories, self.seen,
+            capacity=self.prefetch_size, max_total=self.target_total_questions
+        )
+
+        def on_ready():
+            self.setup_quiz_ui()
+            self.update_question()
 
-        self.setup_quiz_ui()
-        self.update_question()
+        def on_fail():
+            self.start_btn.config(state='normal')
+            messagebox.showerror("Error", "Could not generate initial question.")
+
+        self.start_btn.config(state='disabled')
+        self._request_question(on_ready, on_fail)
 
     def setup_quiz_ui(self):
         """Layout fix, spațios, fără suprapuneri cu footer-ul."""
@@ -341,6 +351,9 @@ class Ui_main_window:
                                   bd=0, padx=15, pady=6, cursor='hand2')
         self.next_btn.pack(side='left', padx=10)
 
+        self._create_progress_indicator(header_frame, "Generating next question...")
+        self.progress_place = {'relx': 0.03, 'rely': 0.5, 'anchor': 'w'}
+
     def update_question(self):
         """Actualizează interfața. Optimizat pentru viteză."""
         if self.current_question_idx == self.target_total_questions - 1:
@@ -498,23 +511,29 @@ class Ui_main_window:
     def next_question(self):
         next_idx = self.current_question_idx + 1
 
-        # Dacă vrem să mergem la o întrebare care nu există încă, o generăm ACUM.
-        if next_idx >= len(self.display_questions):
-            # Opțional: Cursor "busy"
-            self.root.config(cursor="watch")
-            self.root.update()
+        if next_idx < len(self.display_questions):
+            self.current_question_idx += 1
+            self.update_question()
+            return
 
-            success = self._generate_next_question()
+        # Deja așteptăm o întrebare: ignorăm click-urile repetate
+        if self._poll_job is not None:
+            return
+
+        # Întrebarea următoare vine din buffer-ul de prefetch (pop instant).
+        # Dacă buffer-ul e gol, fereastra rămâne activă și afișăm progresul.
+        requested_from = self.current_question_idx
 
-            self.root.config(cursor="")  # Cursor normal
+        def on_ready():
+            # Avansăm doar dacă utilizatorul nu a navigat între timp
+            if self.current_question_idx == requested_from:
+                self.current_question_idx += 1
+                self.update_question()
 
-            if not success:
-                messagebox.showerror("Error", "Could not generate next question.")
-                return
+        def on_fail():
+            messagebox.showerror("Error", "Could not generate next question.")
 
-        # Avansăm
-        self.current_question_idx += 1
-        self.update_question()
+        self._request_question(on_ready, on_fail)
 
     def prev_question(self):
         if self.current_question_idx > 0:
@@ -529,6 +548,7 @@ class Ui_main_window:
                 score += 1
 
         self._save_history(score, len(self.display_questions))
+        self.seen_filter.save()
         self.show_custom_score_popup(score, len(self.display_questions))
 
     def show_custom_score_popup(self, score, total):
@@ -567,5 +587,21 @@ class Ui_main_window:
                   activebackground='#2563eb', activeforeground='white',
                   cursor='hand2', command=lambda: [popup.destroy(), self.show_home_screen()]).pack(pady=35)
 
+    def close_window(self):
+        if self.prefetcher is not None:
+            self.prefetcher.stop()
+        # Workerii își scriu contoarele cache-ului la închidere, deci statisticile se citesc după
+        self.generator_pool.close()
+        stats = self.generator_pool.stats()
+        print(f"Generator pool: {stats['completed_tasks']} tasks, {stats['over_budget_tasks']} over budget, "
+              f"{stats['timed_out_tasks']} timeouts, {stats['recycled_workers']} workers recycled")
+        solver_stats = stats.get('solver_cache')
+        if solver_stats:
+            print(f"Solver cache: {solver_stats['hits']} hits, {solver_stats['misses']} misses "
+                  f"({solver_stats['hit_rate']:.0%}), {solver_stats['evictions']} evictions, "
+                  f"{solver_stats['entries']} entries")
+        self.seen_filter.save()
+        self.root.destroy()
+
     def start_window(self):
         self.root.mainloop()
\ No newline at end of file
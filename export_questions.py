@@ -0,0 +1,131 @@
+# export_questions.py
+"""
+Headless question-bank export (no Tk window).
+
+Example:
+    python export_questions.py --count 20000 --categories nash_equilibrium csp_evaluation \\
+        --seed 42 --workers 8 --output bank.jsonl
+
+With --nash-size ROWS COLS, the whole bank is Nash questions on games of that
+size, generated and solved a few thousand games per vectorized NumPy call.
+
+Every question is written as one JSON line as soon as it is generated, so memory
+use does not grow with the number of exported questions.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from tools.question_generator import QuestionGenerator
+from tools.fingerprint import BloomFilter, SeenInstances
+from tools.solver_cache import SolverCache
+
+
+def get_resources_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate quiz questions in bulk and export them as JSONL.")
+    parser.add_argument('--count', type=int, default=100, help="number of unique questions to write")
+    parser.add_argument('--categories', nargs='+', default=None,
+                        help="categories to cycle through (default: all)")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="master seed; the same seed reproduces the same file")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="number of generator processes (1 = in-process)")
+    parser.add_argument('--output', default='-', help="JSONL file to write ('-' for stdout)")
+    parser.add_argument('--resources', default=get_resources_path(), help="path to the resources folder")
+    parser.add_argument('--cache', default=None,
+                        help="SQLite file caching seeded questions, so re-exporting a known seed is a lookup")
+    parser.add_argument('--cache-size', type=int, default=100000, help="maximum number of cached questions (LRU)")
+    parser.add_argument('--target-latency', type=float, default=0.2,
+                        help="without --seed, pick the largest instance sizes whose measured p99 generation time "
+                             "stays under this many seconds (0 = fixed sizes)")
+    parser.add_argument('--cost-model', default=None,
+                        help="JSON file of measured generation times used by --target-latency, to which the times "
+                             "measured by this export are added (default: cost_model.json in the resources folder, "
+                             "as in the GUI; '' to not keep them)")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="seconds of solver time per question; questions that run out are dropped, not waited for")
+    parser.add_argument('--solver-cache', default=None,
+                        help="SQLite file shared by all workers caching solver results by canonical instance")
+    parser.add_argument('--seen-filter', default=None,
+                        help="Bloom filter file of instance fingerprints; instances already in it are skipped "
+                             "and the new ones are added, so repeated exports do not overlap")
+    parser.add_argument('--nash-size', type=int, nargs=2, metavar=('ROWS', 'COLS'), default=None,
+                        help="write only Nash questions on ROWS x COLS games, generated and solved in vectorized chunks")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cost_model_path = os.path.join(args.resources, 'cost_model.json') if args.cost_model is None else args.cost_model
+    q_gen = QuestionGenerator(args.resources, cache_path=args.cache, cache_size=args.cache_size,
+                              solver_cache_path=args.solver_cache, target_latency=args.target_latency or None,
+                              cost_model_path=cost_model_path or None)
+
+    if args.categories:
+        unknown = [c for c in args.categories if c not in q_gen.categories]
+        if unknown:
+            print(f"Unknown categories: {', '.join(unknown)}. Available: {', '.join(q_gen.categories)}",
+                  file=sys.stderr)
+            return 2
+
+    seen_filter = BloomFilter.open(args.seen_filter) if args.seen_filter else None
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    stats = {}
+    written = 0
+    start = time.perf_counter()
+
+    try:
+        if args.nash_size:
+            batch = q_gen.generate_nash_bank(args.count, *args.nash_size, seed=args.seed,
+                                             with_info=True, stats=stats, seen=SeenInstances(seen_filter))
+        else:
+            batch = q_gen.generate_batch(args.count, categories=args.categories, workers=args.workers,
+                                         seed=args.seed, ordered=args.seed is not None,
+                                         with_info=True, stats=stats, seen=SeenInstances(seen_filter),
+                                         time_budget=args.time_budget)
+        for (question, answer, distractors, explanation), info in batch:
+            record = {
+                'category': info['category'],
+                'seed': info['seed'],
+                'fingerprint': info['fingerprint'],
+                'question': question,
+                'answer': answer,
+                'distractors': distractors,
+                'explanation': explanation,
+            }
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if seen_filter is not None:
+            seen_filter.save()
+        q_gen.close()
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Wrote {written}/{args.count} questions in {elapsed:.2f}s ({rate:.1f} q/s) "
+        f"with {args.workers} worker(s); generated {stats['submitted']}, "
+        f"duplicates {stats['duplicates']}, errors {stats['errors']}, over budget {stats['over_budget']}",
+        file=sys.stderr
+    )
+    if args.solver_cache:
+        solver_stats = SolverCache(args.solver_cache).stats()
+        print(
+            f"Solver cache: {solver_stats['hits']} hits, {solver_stats['misses']} misses "
+            f"({solver_stats['hit_rate']:.0%}), {solver_stats['evictions']} evictions, "
+            f"{solver_stats['entries']} entries",
+            file=sys.stderr
+        )
+    return 0 if written == args.count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
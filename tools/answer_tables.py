@@ -0,0 +1,141 @@
+import json
+import os
+import time
+
+from tools.hanoi import (HanoiProblem, astar_hanoi, load_pattern_database,
+                         PatternDatabaseHeuristic, PDB_GROUP_SIZES)
+from tools.knights_tour import solve_knights_tour
+
+
+# The closed instance spaces that are tabulated; anything outside them is solved on demand
+KNIGHT_BOARD_SIZES = (5, 6, 7, 8, 10, 12, 16, 24)
+HANOI_MAX_DISKS = {3: 12, 4: 10, 5: 8}
+
+# Search budgets the tabulated answers were computed with
+KNIGHT_BACKTRACK_BUDGET = 20000
+HANOI_WEAK_BUDGET = 10000
+
+FILE_NAME = 'answer_tables.json'
+
+# Field order of one knight's-tour record
+_KNIGHT_FIELDS = ('complete', 'greedy', 'warnsdorff_length', 'nodes', 'backtracks', 'budget_exhausted', 'elapsed')
+
+
+def hanoi_race(resources_path, n_disks, pegs, budget=None):
+    """
+    A* with the strongest heuristic available (exact distance for 3 pegs, the
+    additive pattern database otherwise), then with the weak 'misplaced disks'
+    heuristic on a budget. `weak_expanded` is None if the weak run did not finish.
+    Both runs are charged to the shared `budget`, if given.
+    """
+    problem = HanoiProblem(n_disks, pegs)
+    if pegs == 3:
+        heuristic = problem.three_peg_distance
+    else:
+        heuristic = PatternDatabaseHeuristic(problem, load_pattern_database(resources_path, pegs, PDB_GROUP_SIZES[pegs]))
+    result = astar_hanoi(problem, heuristic, budget=budget)
+    weak = astar_hanoi(problem, heuristic=problem.misplaced_disks, max_expansions=HANOI_WEAK_BUDGET, budget=budget)
+    return {
+        'steps': result['steps'],
+        'expanded': result['expanded'],
+        'elapsed': result['elapsed'],
+        'weak_expanded': weak['expanded'] if weak['solved'] else None,
+        'budget_exhausted': result['budget_exhausted'] or weak['budget_exhausted'],
+    }
+
+
+class AnswerTables:
+    """
+    Solver results for every instance of the small closed spaces, keyed by the
+    instance parameters. Lookups return the same dicts as the solvers (or None
+    when the instance is not tabulated), so callers fall back transparently.
+    """
+
+    def __init__(self, hanoi=None, knights=None):
+        self.hanoi = hanoi or {}
+        self.knights = knights or {}
+
+    def hanoi_race(self, n_disks, pegs):
+        return self.hanoi.get(f"{pegs}:{n_disks}")
+
+    def knights_tour(self, n, start):
+        records = self.knights.get(str(n))
+        if records is None:
+            return None
+        record = dict(zip(_KNIGHT_FIELDS, records[start]))
+        record['method'] = 'warnsdorff' if record.pop('greedy') else 'backtracking'
+        for flag in ('complete', 'budget_exhausted'):
+            record[flag] = bool(record[flag])
+        return record
+
+    @classmethod
+    def build(cls, resources_path):
+        hanoi = {}
+        for pegs, max_disks in HANOI_MAX_DISKS.items():
+            for n_disks in range(3, max_disks + 1):
+                hanoi[f"{pegs}:{n_disks}"] = hanoi_race(resources_path, n_disks, pegs)
+
+        knights = {}
+        for n in KNIGHT_BOARD_SIZES:
+            records = []
+            for start in range(n * n):
+                result = solve_knights_tour(n, start, max_backtrack_nodes=KNIGHT_BACKTRACK_BUDGET)
+                records.append([int(result['complete']), int(result['method'] == 'warnsdorff'),
+                                result['warnsdorff_length'], result['nodes'], result['backtracks'],
+                                int(result['budget_exhausted']), round(result['elapsed'], 6)])
+            knights[str(n)] = records
+
+        return cls(hanoi, knights)
+
+    def save(self, path):
+        data = {
+            'knight_budget': KNIGHT_BACKTRACK_BUDGET,
+            'hanoi_weak_budget': HANOI_WEAK_BUDGET,
+            'hanoi': self.hanoi,
+            'knights': self.knights,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        # A table computed with other budgets would give different answers
+        hanoi = data['hanoi'] if data.get('hanoi_weak_budget') == HANOI_WEAK_BUDGET else {}
+        knights = data['knights'] if data.get('knight_budget') == KNIGHT_BACKTRACK_BUDGET else {}
+        return cls(hanoi, knights)
+
+
+_answer_tables = {}
+
+
+def load_answer_tables(resources_path):
+    """Reads the tables from resources once per process; empty tables if the file is missing."""
+    tables = _answer_tables.get(resources_path)
+    if tables is None:
+        path = os.path.join(resources_path, FILE_NAME)
+        if os.path.exists(path):
+            tables = AnswerTables.load(path)
+        else:
+            print(f"{path} not found, solving every instance (build it with: python -m tools.answer_tables)")
+            tables = AnswerTables()
+        _answer_tables[resources_path] = tables
+    return tables
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute the answers of the small closed instance spaces into the resources folder.")
+    parser.add_argument('--resources', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources'))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tables = AnswerTables.build(args.resources)
+    path = os.path.join(args.resources, FILE_NAME)
+    tables.save(path)
+    print(f"{path}: {len(tables.hanoi)} Hanoi and {sum(len(r) for r in tables.knights.values())} knight's tour "
+          f"answers, {os.path.getsize(path)} bytes in {time.perf_counter() - start:.2f}s")
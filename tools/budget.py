@@ -0,0 +1,61 @@
+import time
+
+
+class BudgetExhausted(Exception):
+    """Raised by a caller that cannot use a partial result once its Budget has run out."""
+
+
+class Budget:
+    """
+    Work limit shared by all the solvers answering one question: at most
+    `max_nodes` units of work (search nodes, expansions, moves) and
+    `max_seconds` of wall-clock time, counted from creation.
+
+    Solvers call `spend()` once per unit of work and stop cleanly as soon as it
+    returns False, reporting 'budget_exhausted' with whatever they have. The
+    clock is read only every `check_every` units, so the hot-path cost is a
+    counter increment. Once exhausted, a budget stays exhausted.
+    """
+
+    def __init__(self, max_nodes=None, max_seconds=None, check_every=64):
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.deadline = time.perf_counter() + max_seconds if max_seconds is not None else None
+        self.check_every = check_every
+        self.nodes = 0
+        self.exhausted = False
+        self.reason = None
+        self._next_check = check_every
+
+    def spend(self, nodes=1):
+        """Charges `nodes` units of work; False once the budget has run out."""
+        if self.exhausted:
+            return False
+        self.nodes += nodes
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            return self._exhaust('nodes')
+        if self.deadline is not None and self.nodes >= self._next_check:
+            self._next_check = self.nodes + self.check_every
+            if time.perf_counter() > self.deadline:
+                return self._exhaust('time')
+        return True
+
+    def check(self):
+        """Like spend(0), but always reads the clock (for callers between solver runs)."""
+        if not self.exhausted and self.deadline is not None and time.perf_counter() > self.deadline:
+            self._exhaust('time')
+        return not self.exhausted
+
+    def _exhaust(self, reason):
+        self.exhausted = True
+        self.reason = reason
+        return False
+
+    def __repr__(self):
+        limits = []
+        if self.max_nodes is not None:
+            limits.append(f"{self.nodes}/{self.max_nodes} nodes")
+        if self.max_seconds is not None:
+            limits.append(f"{self.max_seconds}s")
+        state = f"exhausted ({self.reason})" if self.exhausted else "open"
+        return f"Budget({', '.join(limits) or 'unlimited'}, {state})"
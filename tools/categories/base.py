@@ -0,0 +1,52 @@
+class QuestionCategory:
+    """
+    One question category, loaded on demand through tools.category_registry.
+
+    A category draws an instance, solves it and renders the question about it:
+      - generate(rng): (question_text, correct_answer, wrong_answers, explanation),
+        drawing only from `rng`;
+      - solve(instance, rng=None): the solver results for one of its instances
+        (randomized solvers draw from `rng`);
+      - fingerprint(instance): the key of the instance (see tools/fingerprint.py).
+    Instances are plain dicts with a 'kind'. `generate` marks the instance a
+    question is about with `use_instance`, so duplicates can be dropped.
+
+    The QuestionGenerator that owns the category supplies what is shared: the
+    templates, the caches, the size scheduler and the budget of the question.
+    """
+
+    name = None
+
+    # Knob -> sizes the scheduler chooses from for unseeded questions, cheapest first,
+    # each with the number its cost model grows with
+    SCHEDULED_SIZES = {}
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.templates = generator.templates.get(self.name, [])
+
+    def generate(self, rng):
+        raise NotImplementedError
+
+    def solve(self, instance, rng=None):
+        raise NotImplementedError
+
+    def fingerprint(self, instance):
+        raise NotImplementedError
+
+    def use_instance(self, instance):
+        self.generator.set_instance_key(self.fingerprint(instance))
+
+    @property
+    def budget(self):
+        """Budget of the question being generated (None: unlimited)."""
+        return self.generator.budget
+
+    def check_budget(self):
+        self.generator.check_budget()
+
+    def pick_size(self, knob, default_options, rng):
+        return self.generator.pick_size(knob, default_options, self.SCHEDULED_SIZES[knob], rng)
+
+    def solve_cached(self, solver, key_parts, compute):
+        return self.generator.solve_cached(solver, key_parts, compute)
@@ -0,0 +1,219 @@
+from tools.categories.base import QuestionCategory
+from tools.csp_engine import CSPEngine, values_of
+from tools.distractors import CandidateSpace, pick_distractors
+from tools.fingerprint import instance_fingerprint
+from tools.graph_coloring import chromatic_number
+from tools.graph_instances import sample_gnp, variable_name
+
+
+COLORS = ['Red', 'Green', 'Blue', 'Yellow', 'Orange', 'Purple', 'Brown']
+
+
+class CSPCategory(QuestionCategory):
+    """
+    Map coloring with the CSP engine: the domains after a Forward Checking step,
+    and the variable MRV picks next. Instances are search states:
+    {'kind': 'csp-fc' or 'csp-mrv', 'graph', 'num_colors', 'domains', 'assignment'},
+    plus the 'var' and 'value' just assigned for 'csp-fc'.
+    """
+
+    name = 'csp_evaluation'
+
+    SCHEDULED_SIZES = {
+        'csp_graph': [(n, n) for n in range(6, 13)],
+    }
+
+    def generate(self, rng):
+        template_obj = rng.choice(self.templates)
+        raw_text = template_obj['template']
+
+        if 'Forward Checking' in raw_text:
+            return self._solve_forward_checking(raw_text, rng)
+        else:
+            return self._solve_mrv(raw_text, rng)
+
+    def solve(self, instance, rng=None):
+        """'csp-fc': all domains after forward checking and after AC-3; 'csp-mrv': the variable selected next."""
+        state = CSPEngine(instance['graph'], instance['num_colors'], instance['domains'], instance['assignment'])
+        if instance['kind'] == 'csp-mrv':
+            return state.select_variable()
+
+        var = instance['var']
+        state.assign(var, instance['value'])
+        state.forward_check(var)
+        after_fc = list(state.domains)
+        state.ac3([var])
+        return after_fc, list(state.domains)
+
+    def fingerprint(self, instance):
+        parts = [list(instance['graph'].edges()), instance['num_colors'], instance['domains'], instance['assignment']]
+        if instance['kind'] == 'csp-fc':
+            parts += [instance['var'], instance['value']]
+        return instance_fingerprint(instance['kind'], *parts)
+
+    def _csp_search_state(self, rng):
+        """
+        A map-coloring instance and a state taken from inside a real search on it.
+
+        The engine colors the graph with its chromatic number (MRV + degree, forward
+        checking) and copies the domains at a random depth; a fresh engine is then
+        rebuilt on that state so the question can be answered by the same code.
+        """
+        while True:
+            number_of_nodes = self.pick_size('csp_graph', range(6, 13), rng)
+            graph = sample_gnp(number_of_nodes, rng.uniform(0.3, 0.5), rng)
+            if graph.num_edges:
+                break
+
+        nodes_used = [variable_name(v, number_of_nodes) for v in range(number_of_nodes)]
+        k, _, _ = chromatic_number(graph, budget=self.budget)
+        self.check_budget()
+        colors_list = sorted(rng.sample(COLORS, min(len(COLORS), k)))
+
+        depth = rng.randint(1, max(1, number_of_nodes // 2))
+        run = CSPEngine(graph, k).solve('fc', snapshot_depth=depth, budget=self.budget)
+        self.check_budget()
+        snapshot = run['snapshot']
+        if snapshot is None:
+            state = CSPEngine(graph, k)
+        else:
+            state = CSPEngine(graph, k, snapshot['domains'], snapshot['assignment'])
+
+        return nodes_used, colors_list, graph, state, run
+
+    def _state_instance(self, kind, graph, state, **extra):
+        return dict(kind=kind, graph=graph, num_colors=state.num_values, domains=list(state.domains),
+                    assignment=list(state.assignment), **extra)
+
+    def _describe_csp_state(self, nodes_used, colors_list, graph, state):
+        edges = [f"{nodes_used[u]}-{nodes_used[v]}" for u, v in graph.edges()]
+        assigned = [f"{nodes_used[v]} = {colors_list[c]}" for v, c in enumerate(state.assignment) if c != -1]
+        domains = [f"   Variable {nodes_used[v]}: {{{self._domain_str(state.domains[v], colors_list)}}}"
+                   for v in state.unassigned()]
+        return (
+            f"Variables: {', '.join(nodes_used)}\n"
+            f"Initial Domains: {{{', '.join(colors_list)}}}\n"
+            f"Constraints (Edges): {', '.join(edges)}\n"
+            f"Assigned so far: {', '.join(assigned) if assigned else 'nothing'}\n"
+            f"Current Domains:\n" + "\n".join(domains)
+        )
+
+    def _domain_str(self, mask, colors_list):
+        return ", ".join(colors_list[c] for c in values_of(mask))
+
+    def _solve_forward_checking(self, template_text, rng):
+        nodes_used, colors_list, graph, state, run = self._csp_search_state(rng)
+
+        # The move the search makes next: MRV variable, lowest value; otherwise any variable with free neighbors
+        candidates = [v for v in state.unassigned() if any(state.assignment[u] == -1 for u in graph[v])]
+        if not candidates:
+            # Every constraint is already settled at this depth, so ask about the first move instead
+            state = CSPEngine(graph, len(colors_list))
+            run['snapshot'] = None
+            candidates = [v for v in range(len(graph)) if graph.degree(v)]
+        var = state.select_variable()
+        if var not in candidates:
+            var = rng.choice(candidates)
+        value = values_of(state.domains[var])[0]
+        assigned_node, assigned_color = nodes_used[var], colors_list[value]
+
+        neighbors = [u for u in graph[var] if state.assignment[u] == -1]
+        before = {u: state.domains[u] for u in neighbors}
+
+        instance_details = (
+            self._describe_csp_state(nodes_used, colors_list, graph, state) +
+            f"\nRecent Move: Backtracking assigned {assigned_node} = {assigned_color}"
+        )
+
+        instance = self._state_instance('csp-fc', graph, state, var=var, value=value)
+        self.use_instance(instance)
+        domains_fc, domains_ac3 = self.solve(instance)
+        after_fc = {u: domains_fc[u] for u in neighbors}
+        after_ac3 = {u: domains_ac3[u] for u in neighbors}
+
+        def render(domains):
+            return ", ".join(f"{nodes_used[u]}: {{{self._domain_str(domains[u], colors_list)}}}" for u in neighbors)
+
+        correct_ans = render(after_fc)
+        wiped = [nodes_used[u] for u in neighbors if not after_fc[u]]
+
+        explanation = (
+            f"Forward Checking removes the assigned value from the domains of the unassigned neighbors only. "
+            f"Here, {assigned_node} was assigned {assigned_color}, so {assigned_color} is removed from "
+            f"{', '.join(nodes_used[u] for u in neighbors)}; values removed earlier in the search stay removed. "
+        )
+        if after_fc == before:
+            explanation += f"None of them still had {assigned_color} in its domain, so nothing changes. "
+        if wiped:
+            explanation += f"The domain of {', '.join(wiped)} becomes empty, so the search must backtrack. "
+        explanation += (
+            f"This state was reached after {run['snapshot']['nodes'] if run['snapshot'] else 0} search nodes; "
+            f"the full search used {run['stats']['nodes']} nodes, {run['stats']['backtracks']} backtracks and "
+            f"{run['stats']['revisions']} domain revisions."
+        )
+
+        # Near misses: no propagation, full AC-3 instead of FC, forgetting earlier prunings or one neighbor
+        full = (1 << len(colors_list)) - 1
+        near_misses = [
+            render(before),
+            render(after_ac3),
+            render({u: full & ~(1 << value) for u in neighbors}),
+            render({u: before[u] & ~(1 << value) if u != neighbors[0] else before[u] for u in neighbors}),
+            render({u: 1 << value for u in neighbors}),
+        ]
+        # Any other combination of domains for the neighbors
+        space = CandidateSpace.product([range(full + 1)] * len(neighbors),
+                                       lambda *masks: render(dict(zip(neighbors, masks))))
+        wrong_answers = pick_distractors(correct_ans, near_misses, space, rng)
+
+        return template_text.format(instance_details=instance_details), correct_ans, sorted(wrong_answers), explanation
+
+    def _solve_mrv(self, template_text, rng):
+        nodes_used, colors_list, graph, state, run = self._csp_search_state(rng)
+
+        instance_details = (
+            self._describe_csp_state(nodes_used, colors_list, graph, state) +
+            "\nTies are broken by the degree heuristic (most constraints on unassigned variables), then alphabetically."
+        )
+
+        instance = self._state_instance('csp-mrv', graph, state)
+        self.use_instance(instance)
+        unassigned = state.unassigned()
+        size = {v: len(values_of(state.domains[v])) for v in unassigned}
+        best = self.solve(instance)
+        min_len = size[best]
+        correct_ans = f"Variable {nodes_used[best]} (size {min_len})"
+
+        tied = [v for v in unassigned if size[v] == min_len]
+        explanation = (
+            "The MRV (Minimum Remaining Values) heuristic optimizes CSP solving by selecting the variable "
+            "with the fewest legal values left in its domain. This helps identify failures early. "
+        )
+        if len(tied) > 1:
+            explanation += (
+                f"Variables {', '.join(nodes_used[v] for v in tied)} all have {min_len} value(s) left; "
+                f"{nodes_used[best]} has the most unassigned neighbors ({state.free_degree[best]}), so the degree "
+                f"heuristic picks it. "
+            )
+        else:
+            explanation += f"Variable {nodes_used[best]} has the smallest domain size ({min_len}), making it the correct choice. "
+        explanation += (
+            f"The search on this instance visited {run['stats']['nodes']} nodes with {run['stats']['backtracks']} backtracks."
+        )
+
+        def answer(v):
+            return f"Variable {nodes_used[v]} (size {size[v]})"
+
+        # Near misses from perturbed selection rules: MRV without the degree tie-break,
+        # the degree heuristic alone, and the largest domain first
+        near_misses = [
+            answer(tied[0]),
+            answer(min(unassigned, key=lambda v: (-state.free_degree[v], v))),
+            answer(min(unassigned, key=lambda v: (-size[v], v))),
+        ]
+        # Any unassigned variable, with its domain size read right or wrong
+        space = CandidateSpace.product([unassigned, range(1, len(colors_list) + 1)],
+                                       lambda v, k: f"Variable {nodes_used[v]} (size {k})")
+        wrong_answers = pick_distractors(correct_ans, near_misses, space, rng)
+
+        return template_text.format(instance_details=instance_details), correct_ans, sorted(wrong_answers), explanation
@@ -0,0 +1,165 @@
+from tools.categories.base import QuestionCategory
+from tools.distractors import CandidateSpace, pick_distractors
+from tools.fingerprint import instance_fingerprint, session_key
+from tools.game_tree import GameTree, alpha_beta
+from tools.game_search import MNKGame, search, WIN
+
+
+class MinmaxCategory(QuestionCategory):
+    """
+    Alpha-beta on random game trees, and the effect of move ordering on m,n,k
+    positions. Instances: {'kind': 'minmax', 'tree': GameTree} and
+    {'kind': 'minmax-ordering', 'game': MNKGame}.
+    """
+
+    name = 'minmax_evaluation'
+
+    SCHEDULED_SIZES = {
+        'minmax_tree': [((2, 2), 4), ((3, 2), 8), ((2, 3), 9), ((4, 2), 16), ((3, 3), 27)],
+        'minmax_ordering': [((4, 4, 4, 8), 8), ((3, 3, 3, 1), 8), ((4, 4, 4, 7), 9), ((4, 4, 3, 5), 11),
+                            ((3, 3, 3, 0), 12), ((4, 4, 3, 4), 13), ((4, 4, 4, 6), 14)],
+    }
+
+    def generate(self, rng):
+        template_obj = rng.choice(self.templates)
+        raw_text = template_obj['template']
+
+        if template_obj.get('type') == 'logic_minmax_ordering':
+            return self._gen_minmax_ordering(raw_text, rng)
+
+        depth, branching = self.pick_size('minmax_tree', [(2, 3), (2, 2), (3, 2), (3, 3), (4, 2)], rng)
+
+        game_tree = GameTree.random(branching, depth, rng)
+        instance = {'kind': 'minmax', 'tree': game_tree}
+        self.use_instance(instance)
+
+        total_leaves_count = game_tree.num_leaves
+
+        instance_details = (
+            f"Tree Structure (Nested List): {str(game_tree.to_nested())}\n"
+            f"Depth: {depth}\n"
+            f"Branching Factor: {branching}"
+        )
+
+        result, min_root = self.solve(instance)
+        self.check_budget()
+        root_val = result['value']
+        visited_leaves = result['visited_leaves']
+
+        correct_ans = f"Root: {root_val}, Visited leaves: {visited_leaves}"
+
+        explanation = (
+            f"The MinMax algorithm evaluates the tree by propagating values from the leaves. "
+            f"Alpha-Beta pruning optimizes this by cutting off branches that won't affect the decision. "
+            f"Here, the root value is determined to be {root_val}. Due to pruning, the algorithm only needed "
+            f"to visit {visited_leaves} leaves out of a total possible {total_leaves_count} "
+            f"(and {result['visited_internal']} internal nodes, with {result['cutoffs']} cutoffs), proving its efficiency."
+        )
+
+        # Near misses: no pruning at all, and the root played by MIN
+        near_misses = [
+            f"Root: {root_val}, Visited leaves: {total_leaves_count}",
+            f"Root: {min_root['value']}, Visited leaves: {min_root['visited_leaves']}",
+        ]
+        space = CandidateSpace.product(
+            [range(1, 21), range(1, total_leaves_count + 1)],
+            lambda r_val, r_vis: f"Root: {r_val}, Visited leaves: {r_vis}"
+        )
+        wrong_answers = pick_distractors(correct_ans, near_misses, space, rng)
+
+        return raw_text.format(instance_details=instance_details), correct_ans, sorted(wrong_answers), explanation
+
+    def solve(self, instance, rng=None):
+        """
+        'minmax': alpha-beta with MAX and with MIN at the root. 'minmax-ordering':
+        the node counts of plain alpha-beta, ordering + killers, the transposition
+        table and all of them with iterative deepening (the others are None if
+        the plain search ran out of budget), shared through the solver cache.
+        """
+        if instance['kind'] == 'minmax':
+            tree = instance['tree']
+            return (alpha_beta(tree, budget=self.budget),
+                    alpha_beta(tree, maximizing_root=False, budget=self.budget))
+
+        game = instance['game']
+
+        def run_searches():
+            budget = self.budget
+            plain = search(game, max_nodes=40000, budget=budget)
+            if plain['budget_exhausted']:
+                return plain, None, None, None
+            return (plain,
+                    search(game, ordering=True, killers=True, budget=budget),
+                    search(game, transposition_table=True, budget=budget),
+                    search(game, ordering=True, killers=True, transposition_table=True, iterative_deepening=True,
+                           budget=budget))
+
+        # Few distinct openings exist on small boards, so the searches are shared through the solver cache
+        return self.solve_cached('mnk-search/1', (game.m, game.n, game.k, bytes(game.board)), run_searches)
+
+    def fingerprint(self, instance):
+        if instance['kind'] == 'minmax':
+            tree = instance['tree']
+            return instance_fingerprint('minmax', tree.branching, tree.depth, tree.leaves)
+        game = instance['game']
+        key = instance_fingerprint('minmax-ordering', game.m, game.n, game.k, bytes(game.board))
+        # Openings with fewer than two stones are a closed space (ten positions on 3x3)
+        if game.size - game.empties < 2:
+            return session_key(key)
+        return key
+
+    def _gen_minmax_ordering(self, raw_text, rng):
+        # (m, n, k, stones already placed): plain Alpha-Beta needs thousands of positions, capped to keep generation fast
+        m, n, k, stones = self.pick_size(
+            'minmax_ordering', [(3, 3, 3, 0), (3, 3, 3, 1), (4, 4, 3, 5), (4, 4, 4, 7), (4, 4, 4, 8)], rng)
+
+        while True:
+            game = MNKGame(m, n, k)
+            if any(game.play(rng.choice(game.moves())) for _ in range(stones)):
+                continue
+            instance = {'kind': 'minmax-ordering', 'game': game}
+            plain, ordered, with_table, full = self.solve(instance)
+            if not plain['budget_exhausted']:
+                break
+        self.use_instance(instance)
+
+        player = 'X' if game.to_move == 1 else 'O'
+        instance_details = (
+            f"{m}x{n} board, {k} in a row wins (X moves first). {player} to move:\n{game}"
+        )
+
+        correct_ans = f"Board order: {plain['nodes']}, With ordering: {ordered['nodes']}"
+
+        if plain['value'] > WIN // 2:
+            outcome = f"{player} wins"
+        elif plain['value'] < -WIN // 2:
+            outcome = f"{player} loses"
+        else:
+            outcome = "a draw"
+        explanation = (
+            f"With perfect play the position is {outcome} (best move {game.cell_name(plain['best_move'])}). "
+            f"Alpha-Beta prunes more when the best moves are searched first: trying the moves in board order it visits "
+            f"{plain['nodes']} positions ({plain['cutoffs']} cutoffs), while ordering by static evaluation and killer "
+            f"moves brings this to {ordered['nodes']} ({ordered['cutoffs']} cutoffs). The same position is reached "
+            f"through different move orders, so a transposition table keyed by Zobrist hashes helps as well: "
+            f"{with_table['nodes']} positions with a hit rate of {with_table['tt_hit_rate']:.0%}. Combining ordering, "
+            f"the table and iterative deepening visits {full['nodes']} positions over all depths "
+            f"(hit rate {full['tt_hit_rate']:.0%})."
+        )
+
+        def answer(board_order, with_ordering):
+            return f"Board order: {board_order}, With ordering: {with_ordering}"
+
+        # Near misses: the counts of the other search configurations
+        near_misses = [
+            answer(ordered['nodes'], plain['nodes']),
+            answer(plain['nodes'], with_table['nodes']),
+            answer(plain['nodes'], full['nodes']),
+            answer(plain['nodes'], plain['nodes']),
+            answer(with_table['nodes'], ordered['nodes']),
+        ]
+        counts = sorted({plain['nodes'], ordered['nodes'], with_table['nodes'], full['nodes'],
+                         plain['nodes'] // 2, ordered['nodes'] * 2})
+        wrong_answers = pick_distractors(correct_ans, near_misses, CandidateSpace.product([counts, counts], answer), rng)
+
+        return raw_text.format(instance_details=instance_details), correct_ans, sorted(wrong_answers), explanation
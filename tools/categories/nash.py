@@ -0,0 +1,194 @@
+import random
+from fractions import Fraction
+
+import numpy as np
+
+from tools.categories.base import QuestionCategory
+from tools.distractors import CandidateSpace, pick_distractors
+from tools.fingerprint import instance_fingerprint
+from tools.nash import random_games, pure_nash_mask, best_alternatives, is_equilibrium, MixedNashSolver
+
+
+NASH_ROW_NAMES = {2: ["Up", "Down"], 3: ["Up", "Middle", "Down"]}
+NASH_COL_NAMES = {2: ["Left", "Right"], 3: ["Left", "Center", "Right"]}
+
+
+class NashCategory(QuestionCategory):
+    """
+    Pure equilibria of bimatrix games (vectorized, see tools/nash.py) and mixed
+    equilibria of games without a pure one. Instances: {'kind': 'nash' or
+    'nash-mixed', 'payoffs': rows x cols x 2 array}.
+    """
+
+    name = 'nash_equilibrium'
+
+    SCHEDULED_SIZES = {
+        'mixed_nash': [((2, 2), 4), ((2, 3), 6), ((3, 2), 6), ((3, 3), 9), ((4, 4), 16), ((5, 5), 25)],
+    }
+
+    def __init__(self, generator):
+        super().__init__(generator)
+        self.mixed_solver = MixedNashSolver(store=generator.solver_cache)
+
+    def generate(self, rng):
+        template_obj = rng.choice(self.templates)
+        raw_text = template_obj['template']
+
+        if template_obj.get('type') == 'logic_matrix_mixed':
+            return self._gen_mixed_nash(raw_text, rng)
+
+        rows, cols = rng.choice([(2, 2), (2, 2), (2, 3), (3, 2), (3, 3), (3, 4)])
+        instance = {'kind': 'nash', 'payoffs': random_games(1, rows, cols, rng)[0]}
+        self.use_instance(instance)
+        return self._nash_question(instance['payoffs'], self.solve(instance), rng, raw_text)
+
+    def solve(self, instance, rng=None):
+        """The pure-equilibrium mask (also for a batch of games), or the mixed solver's result."""
+        if instance['kind'] == 'nash-mixed':
+            return self.mixed_solver.solve(instance['payoffs'])
+        return pure_nash_mask(instance['payoffs'])
+
+    def fingerprint(self, instance):
+        return instance_fingerprint(instance['kind'], instance['payoffs'])
+
+    def generate_bank(self, rows=2, cols=2, seed=None, chunk_size=4096):
+        """
+        Endless stream of (question, fingerprint) pairs on pure Nash equilibria of
+        rows x cols games. Every `chunk_size` games are generated and solved in one
+        vectorized call (the per-question work left is only formatting), so memory
+        use is bounded by one chunk.
+        """
+        rng = random.Random(seed)
+        while True:
+            payoffs = random_games(chunk_size, rows, cols, rng)
+            masks = self.solve({'kind': 'nash', 'payoffs': payoffs})
+            for g in range(chunk_size):
+                instance = {'kind': 'nash', 'payoffs': payoffs[g]}
+                yield self._nash_question(payoffs[g], masks[g], rng), self.fingerprint(instance)
+
+    def _nash_strategy_names(self, rows, cols):
+        row_names = NASH_ROW_NAMES.get(rows) or [f"R{i + 1}" for i in range(rows)]
+        col_names = NASH_COL_NAMES.get(cols) or [f"C{j + 1}" for j in range(cols)]
+        return row_names, col_names
+
+    def _format_payoffs(self, payoffs):
+        rows, cols = payoffs.shape[:2]
+        row_names, col_names = self._nash_strategy_names(rows, cols)
+        width = 18
+        row_labels = [f"A ({name})" for name in row_names]
+        label_width = max(len(label) for label in row_labels) + 2
+        return "\n".join(
+            [" " * label_width + "".join(f"Player B ({name})".ljust(width) for name in col_names).rstrip()] +
+            [label.ljust(label_width) +
+             "".join(str((int(payoffs[r, c, 0]), int(payoffs[r, c, 1]))).ljust(width) for c in range(cols)).rstrip()
+             for r, label in enumerate(row_labels)]
+        )
+
+    def _gen_mixed_nash(self, raw_text, rng):
+        rows, cols = self.pick_size('mixed_nash', [(2, 2), (2, 2), (2, 3), (3, 2), (3, 3), (4, 4), (5, 5)], rng)
+
+        # Games without a pure equilibrium are drawn from a vectorized batch
+        payoffs = None
+        while payoffs is None:
+            batch = random_games(64, rows, cols, rng)
+            no_pure = np.flatnonzero(~pure_nash_mask(batch).any(axis=(1, 2)))
+            if no_pure.size:
+                payoffs = batch[no_pure[0]]
+
+        instance = {'kind': 'nash-mixed', 'payoffs': payoffs}
+        self.use_instance(instance)
+        # The mixed solvers do not take a budget, so it is checked once they are done
+        result = self.solve(instance)
+        self.check_budget()
+        x, y = result['equilibria'][0]
+        A = [[Fraction(int(v)) for v in row] for row in payoffs[..., 0].tolist()]
+        B = [[Fraction(int(v)) for v in row] for row in payoffs[..., 1].tolist()]
+        row_names, col_names = self._nash_strategy_names(rows, cols)
+
+        def describe(x, y):
+            mix_a = ", ".join(f"{row_names[i]} {p}" for i, p in enumerate(x) if p)
+            mix_b = ", ".join(f"{col_names[j]} {q}" for j, q in enumerate(y) if q)
+            return f"A: ({mix_a}); B: ({mix_b})"
+
+        correct_ans = describe(x, y)
+
+        value_a = sum(A[i][j] * x[i] * y[j] for i in range(rows) for j in range(cols))
+        value_b = sum(B[i][j] * x[i] * y[j] for i in range(rows) for j in range(cols))
+        work = (f"{result['supports_tried']} support pairs tried" if result['method'] == 'support enumeration'
+                else f"{result['pivots']} pivots")
+        explanation = (
+            f"With no pure equilibrium, both players must mix. In a mixed equilibrium each player's mix makes the "
+            f"opponent indifferent between the strategies the opponent uses: against B's mix, every strategy A plays "
+            f"earns {value_a}, and against A's mix every strategy B plays earns {value_b}; unused strategies earn no "
+            f"more. The equilibrium was found by {result['method']} ({work})."
+        )
+
+        # Near misses: uniform mixing and the mixes read in the wrong order (kept only if not an equilibrium);
+        # without a pure equilibrium, every pure profile is wrong as well
+        candidates = [([Fraction(1, rows)] * rows, [Fraction(1, cols)] * cols), (x[::-1], y[::-1])]
+        if rows == cols:
+            candidates.append((y, x))
+        near_misses = [describe(cx, cy) for cx, cy in candidates if not is_equilibrium(A, B, cx, cy)]
+
+        def pure_profile(r, c):
+            return describe([Fraction(int(i == r)) for i in range(rows)], [Fraction(int(j == c)) for j in range(cols)])
+
+        space = CandidateSpace.product([range(rows), range(cols)], pure_profile)
+        wrong_answers = pick_distractors(correct_ans, near_misses, space, rng)
+
+        return raw_text.format(matrix_representation=self._format_payoffs(payoffs)), correct_ans, sorted(wrong_answers), explanation
+
+    def _nash_question(self, payoffs, mask, rng, raw_text=None):
+        if raw_text is None:
+            pure_templates = [t for t in self.templates if t.get('type') == 'logic_matrix']
+            raw_text = rng.choice(pure_templates)['template']
+
+        rows, cols = mask.shape
+        row_names, col_names = self._nash_strategy_names(rows, cols)
+
+        def cell(r, c):
+            return int(payoffs[r, c, 0]), int(payoffs[r, c, 1])
+
+        matrix_str = self._format_payoffs(payoffs)
+
+        def describe(cells):
+            return ", ".join(f"(A:{row_names[r]}, B:{col_names[c]})" for r, c in cells)
+
+        equilibria = [(r, c) for r in range(rows) for c in range(cols) if mask[r, c]]
+        analysis_lines = []
+        for r, c in equilibria:
+            val_a, val_b = cell(r, c)
+            alt_a, alt_b = best_alternatives(payoffs, r, c)
+            analysis_lines.append(
+                f"- {describe([(r, c)])} is stable: A ({val_a} >= {alt_a}) and B ({val_b} >= {alt_b}) cannot improve."
+            )
+
+        no_equilibrium = "No pure Nash equilibrium exists."
+        if not equilibria:
+            ans = no_equilibrium
+            explanation = (
+                f"Checking all {rows * cols} outcomes reveals that in every case, at least one player can improve "
+                f"their payoff by unilaterally switching strategy."
+            )
+        else:
+            ans = "Pure Nash Equilibria: " + describe(equilibria)
+            explanation = "A Nash Equilibrium is a state where no player benefits from changing strategy alone.\n" + "\n".join(analysis_lines)
+
+        def answer(cells):
+            return "Pure Nash Equilibria: " + describe(cells) if cells else no_equilibrium
+
+        # Near misses: the true set with one outcome dropped or added, best responses of one player only
+        all_cells = [(r, c) for r in range(rows) for c in range(cols)]
+        near_sets = [[e for e in equilibria if e != x] for x in equilibria]
+        near_sets += [sorted(equilibria + [x]) for x in all_cells if x not in equilibria]
+        rng.shuffle(near_sets)
+        best_a = payoffs[..., 0] == payoffs[..., 0].max(axis=0, keepdims=True)
+        best_b = payoffs[..., 1] == payoffs[..., 1].max(axis=1, keepdims=True)
+        near_sets = [[x for x in all_cells if best_a[x]], [x for x in all_cells if best_b[x]]] + near_sets[:2]
+
+        # Any other set of outcomes: bit i of the index selects cell i
+        space = CandidateSpace(1 << len(all_cells),
+                               lambda bits: answer([x for i, x in enumerate(all_cells) if bits >> i & 1]))
+        wrong_answers = pick_distractors(ans, [answer(cells) for cells in near_sets], space, rng)
+
+        return raw_text.format(matrix_representation=matrix_str), ans, wrong_answers, explanation
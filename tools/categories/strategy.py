@@ -0,0 +1,349 @@
+from tools.answer_tables import load_answer_tables, hanoi_race, KNIGHT_BACKTRACK_BUDGET, HANOI_WEAK_BUDGET
+from tools.categories.base import QuestionCategory
+from tools.distractors import CandidateSpace, pick_distractors
+from tools.fingerprint import instance_fingerprint, session_key
+from tools.graph_coloring import color_graph, chromatic_number, dsatur_greedy
+from tools.graph_instances import sample_gnp, variable_name
+from tools.hanoi import frame_stewart, PDB_GROUP_SIZES
+from tools.knights_tour import solve_knights_tour
+from tools.n_queens import NQueensBoard, greedy_permutation, min_conflicts
+
+
+# The two algorithms each strategy race compares
+RACE_CONTENDERS = {
+    "n-queens": ["Min-Conflicts Heuristic", "Standard Backtracking"],
+    "generalised Hanoi": ["A* Search", "Greedy Best-First Search"],
+    "graph coloring": ["Backtracking with Forward Checking", "Standard Backtracking"],
+    "knight's tour": ["Greedy Best-First Search", "Standard Backtracking"],
+}
+
+PROBLEMS = [
+    "n-queens",
+    "generalised Hanoi",
+    "graph coloring",
+    "knight's tour"
+]
+
+ALGORITHMS_POOL = [
+    "Random Search",
+    "Breadth-First Search (BFS)",
+    "Uniform Cost Search",
+    "Depth-First Search (DFS)",
+    "Iterative Deepening Search (IDS)",
+    "Bidirectional Search",
+    "Standard Backtracking",
+    "Greedy Best-First Search",
+    "Hillclimbing",
+    "Simulated Annealing",
+    "Beam Search",
+    "A* Search",
+    "IDA* (Iterative Deepening A*)",
+    "Min-Conflicts Heuristic",
+    "Backtracking with Forward Checking"
+]
+
+
+class StrategyCategory(QuestionCategory):
+    """
+    Which strategy suits a problem, decided by racing two algorithms on an instance
+    of it. Instances: {'kind': <problem>, 'description': <instance text>} plus the
+    problem's parameters ('board'; 'n_disks', 'pegs'; 'graph', 'k', 'node_budget';
+    'n', 'start'). Hanoi towers and knight's tour starts are small closed spaces,
+    so their fingerprints are session keys.
+    """
+
+    name = 'strategy_simulation'
+
+    SCHEDULED_SIZES = {
+        'n_queens': [(n, n) for n in (8, 10, 12, 100, 500, 1000, 2000, 5000)],
+        'coloring_large': [((n, d), n * d) for n, d in ((1000, 4), (1000, 6), (1000, 8), (2000, 4), (3000, 4),
+                                                        (2000, 6), (3000, 6), (2000, 8), (3000, 8), (5000, 4),
+                                                        (5000, 6), (5000, 8))],
+    }
+
+    def __init__(self, generator):
+        super().__init__(generator)
+        self._answer_tables = None
+
+    @property
+    def answer_tables(self):
+        """Precomputed answers for the small closed instance spaces, read on first use."""
+        if self._answer_tables is None:
+            self._answer_tables = load_answer_tables(self.generator.resources_path)
+        return self._answer_tables
+
+    def generate(self, rng):
+        template_obj = rng.choice(self.templates)
+        raw_text = template_obj['template']
+
+        problem = rng.choice(PROBLEMS)
+
+        instance, problem_answer, explanation = self.generate_problem_instance(problem, rng)
+        self.use_instance(instance)
+
+        question_text = raw_text.format(problem_name=problem, instance_details=instance['description'])
+        wrong_answers = self._generate_wrong_answers(problem, problem_answer, rng)
+
+        return question_text, problem_answer, wrong_answers, explanation
+
+    def generate_problem_instance(self, problem, rng):
+        """Returns 3 values: the instance, the winning strategy and the explanation."""
+        if problem == 'n-queens':
+            return self._race_n_queens(rng)
+        elif problem == 'generalised Hanoi':
+            return self._race_hanoi_logic(rng)
+        elif problem == 'graph coloring':
+            return self._race_graph_coloring(rng)
+        elif problem == "knight's tour":
+            return self._race_knights_tour(rng)
+
+    def solve(self, instance, rng=None):
+        """
+        The race on one instance: Min-Conflicts (drawing from `rng`) for n-queens,
+        the (smart, naive) coloring runs, the knight's tour and the Hanoi A* runs,
+        the last two from the answer tables when tabulated.
+        """
+        problem = instance['kind']
+        if problem == 'n-queens':
+            board = instance['board']
+            return min_conflicts(board, rng, max_steps=50 * len(board), budget=self.budget)
+
+        if problem == 'graph coloring':
+            graph, k, node_budget = instance['graph'], instance['k'], instance['node_budget']
+            # ALGORITM 1: DSATUR ordering + Forward Checking (Smart)
+            smart = color_graph(graph, k, ordering='dsatur', forward_checking=True, max_nodes=node_budget,
+                                budget=self.budget)
+            # ALGORITM 2: Standard Backtracking, fixed order, no look-ahead (Naive)
+            naive = color_graph(graph, k, ordering='static', forward_checking=False, max_nodes=node_budget,
+                                budget=self.budget)
+            return smart, naive
+
+        if problem == "knight's tour":
+            n, start = instance['n'], instance['start']
+            result = self.answer_tables.knights_tour(n, start)
+            if result is None:
+                result = self.solve_cached('knights-tour/1', (n, start, KNIGHT_BACKTRACK_BUDGET),
+                                           lambda: solve_knights_tour(n, start, max_backtrack_nodes=KNIGHT_BACKTRACK_BUDGET,
+                                                                      budget=self.budget))
+            return result
+
+        # Toate configurațiile folosite sunt precalculate; solverul rulează doar pentru cele lipsă
+        n_disks, pegs = instance['n_disks'], instance['pegs']
+        result = self.answer_tables.hanoi_race(n_disks, pegs)
+        if result is None:
+            result = self.solve_cached('hanoi-race/1', (n_disks, pegs, HANOI_WEAK_BUDGET),
+                                       lambda: hanoi_race(self.generator.resources_path, n_disks, pegs, self.budget))
+        return result
+
+    def fingerprint(self, instance):
+        problem = instance['kind']
+        if problem == 'n-queens':
+            return instance_fingerprint('strategy', problem, instance['board'])
+        if problem == 'graph coloring':
+            graph = instance['graph']
+            return instance_fingerprint('strategy', problem, graph.indptr, graph.indices)
+        if problem == "knight's tour":
+            return session_key(instance_fingerprint('strategy', problem, instance['n'], instance['start']))
+        return session_key(instance_fingerprint('strategy', problem, instance['n_disks'], instance['pegs']))
+
+    def _generate_wrong_answers(self, problem, problem_answer, rng):
+        # The algorithm that lost the race is the near miss; the rest come from the whole pool
+        return pick_distractors(problem_answer, RACE_CONTENDERS.get(problem, []),
+                                CandidateSpace.of(ALGORITHMS_POOL), rng)
+
+    def _race_n_queens(self, rng):
+        # Mostly the classic 8x8 board; sometimes a large board, which the counter-based engine handles cheaply
+        n = self.pick_size('n_queens', [8, 8, 8, 10, 12, 500, 2000], rng)
+
+        if n <= 12:
+            board = [rng.randint(0, n - 1) for _ in range(n)]  # board[col] = row
+            initial_conflicts = NQueensBoard(board).attacking_pairs
+            instance_str = f"An {n}x{n} board with initial configuration (rows): {board}. Current conflicts: {initial_conflicts}."
+        else:
+            board = greedy_permutation(n, rng)
+            self.check_budget()
+            initial_conflicts = NQueensBoard(board).attacking_pairs
+            instance_str = (
+                f"A {n}x{n} board where the queens were placed greedily, one per row and column. "
+                f"Current conflicts (attacking pairs): {initial_conflicts}."
+            )
+        instance = {'kind': 'n-queens', 'description': instance_str, 'board': board}
+
+        # ALGORITM 1: Min-Conflicts, run to a solution within a step budget
+        mc = self.solve(instance, rng)
+        self.check_budget()
+
+        # ALGORITM 2: Random Walk (Uninformed) with the same number of moves
+        rw_board = NQueensBoard(board)
+        for _ in range(max(mc['steps'], 1)):
+            rw_board.move(rng.randrange(n), rng.randrange(n))
+        rw_conf = rw_board.attacking_pairs
+
+        if mc['solved']:
+            winner = "Min-Conflicts Heuristic"
+            explanation = (
+                f"The Min-Conflicts heuristic repeatedly picks a conflicted queen and moves it to the row with the "
+                f"fewest conflicts. Starting from {initial_conflicts} conflicts it reached a solution in {mc['steps']} steps. "
+                f"A random walk with the same number of moves ended with {rw_conf} conflicts."
+            )
+        else:
+            winner = "Standard Backtracking"
+            explanation = (
+                f"Min-Conflicts got stuck on a plateau: after {mc['steps']} steps "
+                f"{mc['final_conflicts']} conflicts remained, and the random walk ended with {rw_conf}. "
+                f"Standard Backtracking is required to systematically explore the tree and escape this local optimum."
+            )
+
+        return instance, winner, explanation
+
+    def _race_graph_coloring(self, rng):
+        # Usually a small graph to draw by hand, sometimes a large sparse one
+        if rng.random() < 0.8:
+            n = rng.randint(8, 12)
+            graph = sample_gnp(n, 0.6, rng)
+            nodes = [variable_name(v, n) for v in range(n)]
+            edge_desc = [f"{nodes[u]}-{nodes[v]}" for u, v in graph.edges()]
+            instance_str = f"Graph nodes: {nodes}. Edges: {', '.join(edge_desc)}."
+
+            # Both strategies must find a coloring with the minimum number of colors
+            k, _, _ = chromatic_number(graph, budget=self.budget)
+            self.check_budget()
+            k_desc = f"{k} colors (the chromatic number)"
+            node_budget = None
+        else:
+            n, avg_degree = self.pick_size(
+                'coloring_large', [(n, d) for n in (1000, 2000, 3000) for d in (4, 6, 8)], rng)
+            graph = sample_gnp(n, avg_degree / (n - 1), rng)
+            self.check_budget()
+            max_degree = max(graph.degree(v) for v in range(n))
+            instance_str = (
+                f"Random sparse graph G(n={n}, p={avg_degree / (n - 1):.5f}): variables X0..X{n - 1}, "
+                f"{graph.num_edges} edges, maximum degree {max_degree}."
+            )
+
+            k = dsatur_greedy(graph, self.budget)['colors_used']
+            self.check_budget()
+            k_desc = f"{k} colors"
+            node_budget = 10 * n
+
+        instance = {'kind': 'graph coloring', 'description': instance_str, 'graph': graph, 'k': k,
+                    'node_budget': node_budget}
+        smart, naive = self.solve(instance)
+        self.check_budget()
+
+        effort = (
+            f"With {k_desc}, DSATUR + Forward Checking visited {smart['nodes']} nodes "
+            f"({smart['wipeouts']} domain wipe-outs caught early), while standard backtracking in fixed variable "
+            f"order visited {naive['nodes']} nodes with {naive['backtracks']} backtracks."
+        )
+        if naive['budget_exhausted']:
+            effort += f" Standard backtracking gave up after its budget of {node_budget} nodes without a coloring."
+
+        if smart['nodes'] < naive['nodes']:
+            winner = "Backtracking with Forward Checking"
+            explanation = (
+                f"Efficient graph coloring picks the most constrained variable first (DSATUR: fewest remaining colors, "
+                f"ties broken by degree) and uses Forward Checking to prune neighbor domains after each assignment. "
+                f"{effort} The look-ahead avoids exploring doomed branches."
+            )
+        else:
+            winner = "Standard Backtracking"
+            explanation = (
+                f"In this instance the plain fixed variable order never runs into a dead end, so the extra bookkeeping of "
+                f"Forward Checking brings no advantage. {effort} Standard Backtracking is the baseline correct answer."
+            )
+
+        return instance, winner, explanation
+
+    def _race_knights_tour(self, rng):
+
+        n = rng.choice([5, 6, 7, 8, 8, 8, 10, 12, 16, 24])
+        cols = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        start_c, start_r = rng.randint(0, n - 1), rng.randint(0, n - 1)
+        start_pos_str = f"{cols[start_c]}{start_r + 1}"
+
+        instance_str = f"{n}x{n} Chessboard. Knight at {start_pos_str}. Goal: Visit all squares."
+
+        # ALGORITM 1: Warnsdorff (Greedy Best-First), ALGORITM 2: Backtracking if it dead-ends
+        instance = {'kind': "knight's tour", 'description': instance_str, 'n': n, 'start': start_r * n + start_c}
+        result = self.solve(instance)
+        total = n * n
+
+        if result['complete'] and result['method'] == 'warnsdorff':
+            winner = "Greedy Best-First Search"
+            explanation = (
+                f"Warnsdorff's Rule is a Greedy Best-First strategy that selects the move leading to the square with the fewest onward moves. "
+                f"From {start_pos_str} it completes the full tour of all {total} squares without a single backtrack. "
+                f"Minimizing the degree prevents the knight from getting stranded early."
+            )
+        elif result['complete']:
+            winner = "Standard Backtracking"
+            explanation = (
+                f"From {start_pos_str}, Warnsdorff's greedy rule gets stranded after {result['warnsdorff_length']} of {total} squares. "
+                f"Backtracking (still trying moves in Warnsdorff order) completes the tour after visiting {result['nodes']} nodes "
+                f"with {result['backtracks']} backtracks."
+            )
+        elif result['budget_exhausted']:
+            winner = "Standard Backtracking"
+            explanation = (
+                f"From {start_pos_str}, Warnsdorff's greedy rule gets stranded after {result['warnsdorff_length']} of {total} squares. "
+                f"Only a systematic search can continue: backtracking explored {result['nodes']} nodes "
+                f"within its budget without finishing, so the greedy rule alone cannot be trusted here."
+            )
+        else:
+            winner = "Standard Backtracking"
+            explanation = (
+                f"No knight's tour starts at {start_pos_str}: Warnsdorff's rule gets stranded after {result['warnsdorff_length']} "
+                f"of {total} squares, and exhaustive backtracking ({result['nodes']} nodes) proves "
+                f"that every alternative fails too. Only a systematic search can establish this."
+            )
+
+        return instance, winner, explanation
+
+    def _race_hanoi_logic(self, rng):
+
+        # With more than 3 pegs the state space grows as pegs^disks, so fewer disks are used
+        pegs = rng.choice([3, 3, 4, 4, 5])
+        max_disks = {3: 12, 4: 10, 5: 8}[pegs]
+        n_disks = rng.randint(3, max_disks)
+
+        optimal_steps_math = frame_stewart(n_disks, pegs)
+        instance_str = f"Hanoi Towers with {n_disks} disks and {pegs} pegs. Goal: Move stack to the last tower."
+
+        # --- IMPLEMENTARE A* SEARCH (stări codificate ca întreg, closed set) ---
+        if pegs == 3:
+            heuristic_name = "exact 3-peg distance"
+        else:
+            heuristic_name = f"additive pattern database ({PDB_GROUP_SIZES[pegs]}-disk groups)"
+        instance = {'kind': 'generalised Hanoi', 'description': instance_str, 'n_disks': n_disks, 'pegs': pegs}
+        result = self.solve(instance)
+        solution_found_steps = result['steps']
+
+        if solution_found_steps == optimal_steps_math:
+            winner = "A* Search"
+            if pegs == 3:
+                optimum_note = f"the optimal solution takes 2^{n_disks} - 1 = {optimal_steps_math} steps"
+            else:
+                optimum_note = f"the Frame–Stewart optimum with {pegs} pegs is {optimal_steps_math} steps"
+            explanation = (
+                f"A* Search combines path cost (g) and heuristic (h) to guarantee optimality. "
+                f"For {n_disks} disks, {optimum_note}. "
+                f"A* with the {heuristic_name} heuristic found the solution in exactly {solution_found_steps} steps, "
+                f"expanding {result['expanded']} nodes. "
+                f"Greedy approaches often yield suboptimal paths."
+            )
+            if result['weak_expanded'] is not None:
+                explanation += (
+                    f" With the weaker 'disks not on the last tower' heuristic, A* needs {result['weak_expanded']} expansions "
+                    f"for the same answer."
+                )
+            else:
+                explanation += (
+                    f" With the weaker 'disks not on the last tower' heuristic, A* was still searching after "
+                    f"{HANOI_WEAK_BUDGET} expansions."
+                )
+        else:
+            winner = "Greedy Best-First Search"
+            explanation = "A suboptimal path was found, which is typical for Greedy Search."
+
+        return instance, winner, explanation
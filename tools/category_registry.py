@@ -0,0 +1,44 @@
+import importlib
+
+
+# Category name -> "module:class" of its implementation (a tools.categories.base.QuestionCategory).
+# Modules are imported on first use, so a process pays only for the categories it generates.
+CATEGORY_MODULES = {
+    'strategy_simulation': 'tools.categories.strategy:StrategyCategory',
+    'nash_equilibrium': 'tools.categories.nash:NashCategory',
+    'csp_evaluation': 'tools.categories.csp:CSPCategory',
+    'minmax_evaluation': 'tools.categories.minmax:MinmaxCategory',
+}
+
+_classes = {}
+
+
+def register_category(name, target):
+    """
+    Adds (or replaces) category `name`; `target` is "module:class" or the class itself.
+
+    Worker processes started with 'spawn' only see categories registered by code
+    they import as well, so plugins should register when their module is imported.
+    """
+    CATEGORY_MODULES[name] = target
+    _classes.pop(name, None)
+
+
+def category_names():
+    return list(CATEGORY_MODULES)
+
+
+def load_category(name):
+    """The class of category `name`, importing its module the first time."""
+    cls = _classes.get(name)
+    if cls is None:
+        target = CATEGORY_MODULES.get(name)
+        if target is None:
+            raise ValueError(f"Unknown category '{name}'. Available: {', '.join(CATEGORY_MODULES)}")
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(':')
+            cls = getattr(importlib.import_module(module_name), class_name)
+        else:
+            cls = target
+        _classes[name] = cls
+    return cls
@@ -0,0 +1,245 @@
+import heapq
+import time
+from collections import deque
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+def values_of(mask):
+    """Indices of the set bits of a domain mask, smallest first."""
+    values = []
+    while mask:
+        low = mask & -mask
+        values.append(low.bit_length() - 1)
+        mask ^= low
+    return values
+
+
+class CSPEngine:
+    """
+    Binary "all neighbors differ" CSP (map / graph coloring) over `num_values` values.
+
+    Domains are integer bitmasks. Every change to a domain is pushed on a trail, so
+    undoing an assignment restores exactly the domains it pruned. Variable selection
+    is MRV with the degree heuristic (most unassigned neighbors) as tie-break, then
+    the lowest index; it runs through a lazy heap instead of a scan over all variables.
+
+    `stats` counts nodes, backtracks, arc revisions, pruned values and wipe-outs, and
+    splits the time between propagation and variable selection.
+    """
+
+    def __init__(self, adj, num_values, domains=None, assignment=None):
+        self.adj = adj
+        self.n = len(adj)
+        self.num_values = num_values
+        self.full = (1 << num_values) - 1
+        self.domains = list(domains) if domains is not None else [self.full] * self.n
+        self.assignment = list(assignment) if assignment is not None else [-1] * self.n
+        self.trail = []
+
+        self.free_degree = [0] * self.n
+        for v in range(self.n):
+            self.free_degree[v] = sum(1 for u in adj[v] if self.assignment[u] == -1)
+        self.heap = [self._key(v) for v in range(self.n) if self.assignment[v] == -1]
+        heapq.heapify(self.heap)
+
+        self.stats = {
+            'nodes': 0,
+            'backtracks': 0,
+            'arc_checks': 0,
+            'revisions': 0,
+            'pruned_values': 0,
+            'wipeouts': 0,
+            'propagation_time': 0.0,
+            'selection_time': 0.0,
+        }
+
+    def _key(self, v):
+        return (_popcount(self.domains[v]), -self.free_degree[v], v)
+
+    def _set_domain(self, v, mask):
+        self.trail.append((v, self.domains[v]))
+        self.stats['pruned_values'] += _popcount(self.domains[v] & ~mask)
+        self.domains[v] = mask
+        if self.assignment[v] == -1:
+            heapq.heappush(self.heap, self._key(v))
+
+    def unassigned(self):
+        return [v for v in range(self.n) if self.assignment[v] == -1]
+
+    def select_variable(self):
+        """MRV, then degree, then index; None once every variable is assigned."""
+        start = time.perf_counter()
+        heap = self.heap
+        chosen = None
+        while heap:
+            key = heap[0]
+            v = key[2]
+            if self.assignment[v] == -1 and key == self._key(v):
+                chosen = v
+                break
+            heapq.heappop(heap)
+        self.stats['selection_time'] += time.perf_counter() - start
+        return chosen
+
+    def assign(self, var, value):
+        """Fixes var = value; returns the trail mark to undo back to."""
+        mark = len(self.trail)
+        self.trail.append((var, self.domains[var]))
+        self.domains[var] = 1 << value
+        self.assignment[var] = value
+        for u in self.adj[var]:
+            self.free_degree[u] -= 1
+            if self.assignment[u] == -1:
+                heapq.heappush(self.heap, self._key(u))
+        return mark
+
+    def undo(self, var, mark):
+        while len(self.trail) > mark:
+            v, mask = self.trail.pop()
+            self.domains[v] = mask
+        self.assignment[var] = -1
+        for u in self.adj[var]:
+            self.free_degree[u] += 1
+            if self.assignment[u] == -1:
+                heapq.heappush(self.heap, self._key(u))
+        heapq.heappush(self.heap, self._key(var))
+
+    def forward_check(self, var):
+        """Removes var's value from its unassigned neighbors; False on a wipe-out."""
+        start = time.perf_counter()
+        bit = self.domains[var]
+        ok = True
+        for u in self.adj[var]:
+            if self.assignment[u] != -1:
+                continue
+            self.stats['arc_checks'] += 1
+            if self.domains[u] & bit:
+                self.stats['revisions'] += 1
+                self._set_domain(u, self.domains[u] & ~bit)
+                if not self.domains[u]:
+                    self.stats['wipeouts'] += 1
+                    ok = False
+                    break
+        self.stats['propagation_time'] += time.perf_counter() - start
+        return ok
+
+    def ac3(self, start_vars=None):
+        """
+        Arc consistency over the unassigned variables (MAC when called after an assignment).
+
+        For an inequality constraint, revising arc (x, y) can only remove the value
+        of y when y's domain is a single value. Starting from `start_vars` (default:
+        every variable), arcs (neighbor, v) are queued; when x's domain shrinks, the
+        arcs pointing at x are queued again. Returns False on a wipe-out.
+        """
+        start = time.perf_counter()
+        domains = self.domains
+        queue = deque()
+        queued = set()
+        for v in (range(self.n) if start_vars is None else start_vars):
+            for u in self.adj[v]:
+                if (u, v) not in queued:
+                    queue.append((u, v))
+                    queued.add((u, v))
+
+        ok = True
+        while queue:
+            x, y = queue.popleft()
+            queued.discard((x, y))
+            if self.assignment[x] != -1:
+                continue
+            self.stats['arc_checks'] += 1
+            dy = domains[y]
+            if dy & (dy - 1) or not dy & domains[x]:
+                continue
+
+            self.stats['revisions'] += 1
+            self._set_domain(x, domains[x] & ~dy)
+            if not domains[x]:
+                self.stats['wipeouts'] += 1
+                ok = False
+                break
+            for z in self.adj[x]:
+                if z != y and (z, x) not in queued:
+                    queue.append((z, x))
+                    queued.add((z, x))
+
+        self.stats['propagation_time'] += time.perf_counter() - start
+        return ok
+
+    def propagate(self, var, inference):
+        if inference == 'ac3':
+            return self.ac3([var])
+        if inference == 'fc':
+            return self.forward_check(var)
+        return all(self.assignment[u] == -1 or self.assignment[u] != self.assignment[var] for u in self.adj[var])
+
+    def solve(self, inference='ac3', max_nodes=None, snapshot_depth=None, budget=None):
+        """
+        Depth-first search with an explicit stack (no recursion limit on large graphs).
+
+        inference is 'ac3' (maintain arc consistency), 'fc' (forward checking) or
+        'none' (only check the constraints against assigned neighbors). With
+        snapshot_depth, the assignment and domains are copied the first time the
+        search stands at that depth, before it picks the next variable. Every node
+        is also charged to the shared `budget` (a tools.budget.Budget), if given.
+        """
+        start_time = time.perf_counter()
+        stats = self.stats
+        snapshot = None
+        solved = False
+        exhausted = False
+
+        consistent = inference != 'ac3' or self.ac3()
+        var = self.select_variable() if consistent else None
+        if consistent and var is None:
+            solved = True
+        stack = [[var, values_of(self.domains[var]), None]] if var is not None else []
+
+        while stack:
+            frame = stack[-1]
+            var, remaining, mark = frame
+            if mark is not None:
+                self.undo(var, mark)
+                frame[2] = None
+
+            if not remaining:
+                stack.pop()
+                stats['backtracks'] += 1
+                continue
+
+            if (max_nodes is not None and stats['nodes'] >= max_nodes) or (budget is not None and not budget.spend()):
+                exhausted = True
+                break
+
+            value = remaining.pop(0)
+            stats['nodes'] += 1
+            frame[2] = self.assign(var, value)
+            if not self.propagate(var, inference):
+                continue
+
+            if snapshot is None and len(stack) == snapshot_depth:
+                snapshot = {
+                    'depth': len(stack),
+                    'assignment': list(self.assignment),
+                    'domains': list(self.domains),
+                    'nodes': stats['nodes'],
+                }
+
+            next_var = self.select_variable()
+            if next_var is None:
+                solved = True
+                break
+            stack.append([next_var, values_of(self.domains[next_var]), None])
+
+        return {
+            'solved': solved,
+            'assignment': list(self.assignment) if solved else None,
+            'budget_exhausted': exhausted,
+            'snapshot': snapshot,
+            'stats': dict(stats),
+            'elapsed': time.perf_counter() - start_time,
+        }
@@ -0,0 +1,94 @@
+import random
+
+
+FILLERS = [
+    "None of the other answers",
+    "It cannot be determined from the given data",
+    "More than one of the other answers",
+]
+
+
+class CandidateSpace:
+    """
+    A finite set of wrong-answer candidates that is never materialized: answer
+    number i (0 <= i < size) is built on demand by `build(i)`.
+    """
+
+    def __init__(self, size, build):
+        self.size = size
+        self.build = build
+
+    @classmethod
+    def of(cls, items):
+        items = list(items)
+        return cls(len(items), items.__getitem__)
+
+    @classmethod
+    def product(cls, axes, fmt):
+        """Every combination of one value per axis (mixed-radix numbering), formatted by fmt(*values)."""
+        axes = [list(axis) for axis in axes]
+        size = 1
+        for axis in axes:
+            size *= len(axis)
+
+        def build(i):
+            values = []
+            for axis in reversed(axes):
+                i, digit = divmod(i, len(axis))
+                values.append(axis[digit])
+            return fmt(*reversed(values))
+
+        return cls(size, build)
+
+
+def _sample_indices(size, rng):
+    """
+    Distinct uniform indices from range(size), lazily: a Fisher-Yates shuffle that
+    only records the swapped positions, so each draw is O(1) even for huge spaces.
+    """
+    swapped = {}
+    for i in range(size):
+        j = rng.randrange(i, size)
+        yield swapped.get(j, j)
+        swapped[j] = swapped.get(i, i)
+
+
+def pick_distractors(correct, near_misses=(), space=None, rng=None, k=3, max_draws=64):
+    """
+    Exactly `k` distinct wrong answers for `correct`.
+
+    The near misses (answers a solver gives under a perturbed configuration, or
+    typical mistakes) come first, in order; the rest are sampled without
+    replacement from `space`. A draw that repeats the correct answer or an answer
+    already picked is skipped, and after `max_draws` draws, or once the space is
+    exhausted, generic fillers complete the list, so the time is bounded.
+    """
+    if rng is None:
+        rng = random.Random()
+
+    picked = []
+    seen = {correct}
+    for candidate in near_misses:
+        if len(picked) == k:
+            break
+        if candidate not in seen:
+            seen.add(candidate)
+            picked.append(candidate)
+
+    if space is not None and len(picked) < k:
+        for draws, index in enumerate(_sample_indices(space.size, rng)):
+            if len(picked) == k or draws >= max_draws:
+                break
+            candidate = space.build(index)
+            if candidate not in seen:
+                seen.add(candidate)
+                picked.append(candidate)
+
+    for candidate in FILLERS:
+        if len(picked) == k:
+            break
+        if candidate not in seen:
+            seen.add(candidate)
+            picked.append(candidate)
+
+    return picked
@@ -0,0 +1,140 @@
+import hashlib
+import math
+import os
+import struct
+
+
+def instance_fingerprint(kind, *parts):
+    """
+    Fixed-size key (32 hex characters) for a generated instance.
+
+    `parts` are the canonical data of the instance, never its rendered text:
+    arrays and buffers are hashed by their raw bytes (with their shape), any
+    other value by its repr, so two questions on the same instance share a key
+    however they are worded or laid out.
+    """
+    digest = hashlib.blake2b(kind.encode('utf-8'), digest_size=16)
+    for part in parts:
+        if hasattr(part, 'tobytes'):
+            digest.update(repr(getattr(part, 'shape', len(part))).encode('ascii'))
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+# Keys of instances from small closed spaces (a few dozen Hanoi configurations, a
+# few thousand knight's tour starts) carry this prefix: they are told apart within a
+# run but kept out of the persisted filter, which would otherwise use the space up
+SESSION_PREFIX = 'session:'
+
+
+def session_key(key):
+    return SESSION_PREFIX + key
+
+
+def is_session_key(key):
+    return key.startswith(SESSION_PREFIX)
+
+
+class BloomFilter:
+    """
+    Fixed-size set of fingerprints with no false negatives and about
+    `error_rate` false positives at `capacity` keys.
+
+    The k bit positions of a key come from double hashing its two 64-bit halves.
+    The filter can be saved to a file (a small header followed by the bit array),
+    so the set survives between sessions.
+    """
+
+    MAGIC = b'BLM1'
+    HEADER = struct.Struct('<4sQIQ')
+
+    def __init__(self, num_bits, num_hashes, bits=None, count=0, path=None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = count
+        self.path = path
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate=0.01, path=None):
+        num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return cls(num_bits, num_hashes, path=path)
+
+    @classmethod
+    def open(cls, path, capacity=100000, error_rate=0.01):
+        """Loads the filter saved at `path`, or starts an empty one that will be saved there."""
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as file:
+                    magic, num_bits, num_hashes, count = cls.HEADER.unpack(file.read(cls.HEADER.size))
+                    bits = bytearray(file.read())
+                if magic == cls.MAGIC and len(bits) == (num_bits + 7) // 8:
+                    return cls(num_bits, num_hashes, bits, count, path)
+            except (OSError, struct.error):
+                pass
+            print(f"Ignoring unreadable filter file {path}")
+        return cls.for_capacity(capacity, error_rate, path)
+
+    def _positions(self, key):
+        h = int(key, 16)
+        h1 = h & 0xFFFFFFFFFFFFFFFF
+        h2 = (h >> 64) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+    def save(self, path=None):
+        path = path or self.path
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.num_bits, self.num_hashes, self.count))
+            file.write(self.bits)
+        os.replace(tmp_path, path)
+
+
+class SeenInstances:
+    """
+    Fingerprints already used: an exact set for the current run, optionally
+    backed by a (persisted) BloomFilter for everything seen in earlier runs.
+    Session keys (see session_key) only go to the set.
+    """
+
+    def __init__(self, bloom=None):
+        self.keys = set()
+        self.bloom = bloom
+
+    def add_if_new(self, key):
+        """Records `key`; False if it was already seen (here or, probably, in the filter)."""
+        if key in self:
+            return False
+        self.keys.add(key)
+        if self._persisted(key):
+            self.bloom.add(key)
+        return True
+
+    def _persisted(self, key):
+        """Whether `key` is remembered across runs, in the filter."""
+        return self.bloom is not None and not is_session_key(key)
+
+    def __contains__(self, key):
+        return key in self.keys or (self._persisted(key) and key in self.bloom)
+
+    def __len__(self):
+        return len(self.keys)
@@ -0,0 +1,233 @@
+import random
+import time
+
+
+WIN = 1000
+
+
+class MNKGame:
+    """
+    m x n board, k in a row wins (tic-tac-toe is 3, 3, 3). Players are 1 and 2 and
+    player 1 moves first.
+
+    The same position is reached through many move orders, so the game graph is a
+    DAG. Every position carries a Zobrist hash (the XOR of one random 64-bit key per
+    occupied cell and player), updated with one XOR per move.
+    """
+
+    def __init__(self, m, n, k, zobrist_seed=0):
+        self.m, self.n, self.k = m, n, k
+        self.size = m * n
+
+        self.lines = []
+        for r in range(m):
+            for c in range(n):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < m and 0 <= end_c < n:
+                        self.lines.append(tuple((r + dr * i) * n + c + dc * i for i in range(k)))
+        self.cell_lines = [[line for line in self.lines if cell in line] for cell in range(self.size)]
+
+        keys = random.Random(zobrist_seed)
+        self.zobrist = [(0, keys.getrandbits(64), keys.getrandbits(64)) for _ in range(self.size)]
+
+        self.board = [0] * self.size
+        self.hash = 0
+        self.to_move = 1
+        self.empties = self.size
+
+    def cell_name(self, cell):
+        r, c = divmod(cell, self.n)
+        return f"{chr(ord('A') + c)}{r + 1}"
+
+    def play(self, cell):
+        """Places the mover's stone; returns True if it completes a line."""
+        player = self.to_move
+        self.board[cell] = player
+        self.hash ^= self.zobrist[cell][player]
+        self.to_move = 3 - player
+        self.empties -= 1
+        board = self.board
+        return any(all(board[i] == player for i in line) for line in self.cell_lines[cell])
+
+    def undo(self, cell):
+        player = self.board[cell]
+        self.board[cell] = 0
+        self.hash ^= self.zobrist[cell][player]
+        self.to_move = player
+        self.empties += 1
+
+    def moves(self):
+        return [cell for cell in range(self.size) if not self.board[cell]]
+
+    def winner(self):
+        board = self.board
+        for line in self.lines:
+            first = board[line[0]]
+            if first and all(board[i] == first for i in line):
+                return first
+        return 0
+
+    def evaluate(self):
+        """Static score for the side to move: lines still open for it minus lines open for the opponent, by stone count."""
+        me, board = self.to_move, self.board
+        score = 0
+        for line in self.lines:
+            mine = theirs = 0
+            for i in line:
+                if board[i] == me:
+                    mine += 1
+                elif board[i]:
+                    theirs += 1
+            if not theirs:
+                score += mine * mine
+            elif not mine:
+                score -= theirs * theirs
+        return score
+
+    def move_score(self, cell):
+        """Ordering key: how much a stone on `cell` builds own lines and blocks the opponent's."""
+        me, board = self.to_move, self.board
+        score = 0
+        for line in self.cell_lines[cell]:
+            mine = theirs = 0
+            for i in line:
+                if board[i] == me:
+                    mine += 1
+                elif board[i]:
+                    theirs += 1
+            if not theirs:
+                score += 1 + mine * mine * 2
+            elif not mine:
+                score += 1 + theirs * theirs
+        return score
+
+    def __str__(self):
+        symbols = {0: '.', 1: 'X', 2: 'O'}
+        header = "   " + " ".join(chr(ord('A') + c) for c in range(self.n))
+        rows = [f"{r + 1:>2} " + " ".join(symbols[self.board[r * self.n + c]] for c in range(self.n)) for r in range(self.m)]
+        return "\n".join([header] + rows)
+
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def search(game, max_depth=None, ordering=False, killers=False, transposition_table=False,
+           iterative_deepening=False, max_nodes=None, budget=None):
+    """
+    Negamax alpha-beta from the current position of `game`.
+
+    ordering sorts moves by MNKGame.move_score; killers tries the moves that caused
+    cutoffs at the same ply first; the transposition table (keyed by the Zobrist
+    hash) stores exact values and bounds together with the best move, which is tried
+    first on the next visit. With iterative deepening the depths 1..max_depth are
+    searched in turn, sharing the table and the killer moves.
+
+    A won position is worth WIN + empty cells for the winner, so quicker wins score
+    higher and the value does not depend on the path. Returns the value for the side
+    to move, the best move and the counters (nodes, cutoffs, table probes and hits).
+    When `max_nodes` or the shared `budget` runs out, the search stops with the
+    result of the last completed depth and the board is restored.
+    """
+    start_time = time.perf_counter()
+    if max_depth is None:
+        max_depth = game.empties
+
+    table = {}
+    killer_moves = [[] for _ in range(game.size + 1)]
+    stats = {'nodes': 0, 'cutoffs': 0, 'tt_probes': 0, 'tt_hits': 0, 'budget_exhausted': False}
+
+    class BudgetExhausted(Exception):
+        pass
+
+    def negamax(depth, alpha, beta, ply):
+        stats['nodes'] += 1
+        if max_nodes is not None and stats['nodes'] > max_nodes:
+            raise BudgetExhausted()
+        if budget is not None and not budget.spend():
+            raise BudgetExhausted()
+
+        if game.empties == 0:
+            return 0, None
+        if depth == 0:
+            return game.evaluate(), None
+
+        hash_move = None
+        if transposition_table:
+            stats['tt_probes'] += 1
+            entry = table.get(game.hash)
+            if entry is not None:
+                stats['tt_hits'] += 1
+                entry_depth, value, flag, hash_move = entry
+                if entry_depth >= depth:
+                    if flag == EXACT:
+                        return value, hash_move
+                    if flag == LOWER and value > alpha:
+                        alpha = value
+                    elif flag == UPPER and value < beta:
+                        beta = value
+                    if alpha >= beta:
+                        return value, hash_move
+
+        moves = game.moves()
+        if ordering:
+            moves.sort(key=game.move_score, reverse=True)
+        front = []
+        if hash_move is not None:
+            front.append(hash_move)
+        if killers:
+            front.extend(m for m in killer_moves[ply] if m not in front and not game.board[m])
+        if front:
+            moves = front + [m for m in moves if m not in front]
+
+        alpha_orig = alpha
+        best, best_move = -WIN * 2, None
+        for cell in moves:
+            if game.play(cell):
+                stats['nodes'] += 1
+                value = WIN + game.empties
+            else:
+                value = -negamax(depth - 1, -beta, -alpha, ply + 1)[0]
+            game.undo(cell)
+
+            if value > best:
+                best, best_move = value, cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                stats['cutoffs'] += 1
+                if killers and cell not in killer_moves[ply]:
+                    killer_moves[ply] = [cell] + killer_moves[ply][:1]
+                break
+
+        if transposition_table:
+            if best <= alpha_orig:
+                flag = UPPER
+            elif best >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            table[game.hash] = (depth, best, flag, best_move)
+        return best, best_move
+
+    depths = range(1, max_depth + 1) if iterative_deepening else [max_depth]
+    value, best_move, completed_depth = None, None, 0
+    saved = (list(game.board), game.hash, game.to_move, game.empties)
+    try:
+        for depth in depths:
+            value, best_move = negamax(depth, -WIN * 2, WIN * 2, 0)
+            completed_depth = depth
+    except BudgetExhausted:
+        # The interrupted search leaves moves on the board
+        stats['budget_exhausted'] = True
+        game.board, game.hash, game.to_move, game.empties = saved
+
+    stats.update(
+        value=value,
+        best_move=best_move,
+        depth=completed_depth,
+        tt_hit_rate=stats['tt_hits'] / stats['tt_probes'] if stats['tt_probes'] else 0.0,
+        tt_entries=len(table),
+        elapsed=time.perf_counter() - start_time,
+    )
+    return stats
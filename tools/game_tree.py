@@ -0,0 +1,158 @@
+import random
+import time
+from array import array
+
+
+class GameTree:
+    """
+    Uniform game tree stored as one flat buffer of leaf values.
+
+    Nothing but the leaves is kept: with branching factor b, the children of the
+    node with index i on one level are the indices i*b .. i*b + b - 1 on the next
+    level, so the leaf under a path of child choices is just that path read as a
+    base-b number. A tree with 2^20 leaves costs one byte per leaf.
+    """
+
+    def __init__(self, branching, depth, leaves):
+        if len(leaves) != branching ** depth:
+            raise ValueError(f"Expected {branching ** depth} leaves, got {len(leaves)}")
+        self.branching = branching
+        self.depth = depth
+        self.leaves = leaves
+
+    @classmethod
+    def random(cls, branching, depth, rng=None, low=1, high=20):
+        """Leaf values in [low, high] (at most 256 distinct values, one signed byte each)."""
+        if rng is None:
+            rng = random.Random()
+        span = high - low + 1
+        if not 0 < span <= 256 or low < -128 or high > 127:
+            raise ValueError("Leaf values must fit in a signed byte")
+
+        count = branching ** depth
+        if count <= 4096:
+            return cls(branching, depth, array('b', [rng.randint(low, high) for _ in range(count)]))
+
+        # Large trees: one random byte per leaf, mapped onto the range with a translation table
+        table = bytes((low + (b * span >> 8)) & 0xFF for b in range(256))
+        leaves = array('b')
+        leaves.frombytes(rng.randbytes(count).translate(table))
+        return cls(branching, depth, leaves)
+
+    @property
+    def num_leaves(self):
+        return len(self.leaves)
+
+    def to_nested(self):
+        """Nested-list form, for showing small trees."""
+        level = list(self.leaves)
+        for _ in range(self.depth):
+            b = self.branching
+            level = [level[i:i + b] for i in range(0, len(level), b)]
+        return level[0]
+
+
+def alpha_beta(tree, maximizing_root=True, budget=None):
+    """
+    Minimax with alpha-beta pruning, children searched left to right, no recursion.
+
+    The path from the root is kept in per-level lists (index, next child, alpha,
+    beta, best value), so the extra memory is O(depth) whatever the tree size. The
+    children of the last internal level are read straight from a slice of the leaf
+    buffer. Returns the root value with visited leaf / internal node and cutoff counts.
+
+    Every internal node is charged to the shared `budget`, if given; when it runs
+    out the search stops with 'budget_exhausted' set and no root value.
+    """
+    start_time = time.perf_counter()
+    b, depth, leaves = tree.branching, tree.depth, tree.leaves
+    if depth == 0:
+        return {'value': leaves[0], 'visited_leaves': 1, 'visited_internal': 0, 'cutoffs': 0,
+                'budget_exhausted': False, 'elapsed': time.perf_counter() - start_time}
+
+    inf = float('inf')
+    index = [0] * depth
+    child = [0] * depth
+    alpha = [-inf] * depth
+    beta = [inf] * depth
+    best = [0] * depth
+    is_max = [(d % 2 == 0) == maximizing_root for d in range(depth)]
+    best[0] = -inf if is_max[0] else inf
+
+    visited_leaves = 0
+    visited_internal = 1
+    cutoffs = 0
+    exhausted = False
+    last = depth - 1
+    d = 0
+
+    while True:
+        if d == last:
+            # Children are leaves: scan them in place
+            a, bt, value = alpha[d], beta[d], best[d]
+            start = index[d] * b
+            seen = visited_leaves
+            if is_max[d]:
+                for leaf in leaves[start:start + b]:
+                    visited_leaves += 1
+                    if leaf > value:
+                        value = leaf
+                        if value > a:
+                            a = value
+                    if bt <= a:
+                        break
+            else:
+                for leaf in leaves[start:start + b]:
+                    visited_leaves += 1
+                    if leaf < value:
+                        value = leaf
+                        if value < bt:
+                            bt = value
+                    if bt <= a:
+                        break
+            if visited_leaves - seen < b:
+                cutoffs += 1
+            child[d] = b
+        elif child[d] < b and alpha[d] < beta[d]:
+            if budget is not None and not budget.spend():
+                exhausted = True
+                break
+            c = index[d] * b + child[d]
+            child[d] += 1
+            d += 1
+            index[d] = c
+            child[d] = 0
+            alpha[d] = alpha[d - 1]
+            beta[d] = beta[d - 1]
+            best[d] = -inf if is_max[d] else inf
+            visited_internal += 1
+            continue
+        else:
+            value = best[d]
+
+        if d == 0:
+            break
+
+        # Hand the finished child's value to its parent
+        d -= 1
+        if is_max[d]:
+            if value > best[d]:
+                best[d] = value
+                if value > alpha[d]:
+                    alpha[d] = value
+        else:
+            if value < best[d]:
+                best[d] = value
+                if value < beta[d]:
+                    beta[d] = value
+        if beta[d] <= alpha[d] and child[d] < b:
+            cutoffs += 1
+
+    return {
+        'value': None if exhausted else best[0] if depth > 1 else value,
+        'visited_leaves': visited_leaves,
+        'visited_internal': visited_internal,
+        'cutoffs': cutoffs,
+        'budget_exhausted': exhausted,
+        'elapsed': time.perf_counter() - start_time,
+    }
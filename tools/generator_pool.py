@@ -0,0 +1,285 @@
+import multiprocessing
+import queue
+import threading
+import itertools
+from concurrent.futures import Future
+
+from tools.question_generator import QuestionGenerator
+from tools.solver_cache import SolverCache
+from tools.budget import Budget, BudgetExhausted
+
+
+def run_task(gen, category, time_budget):
+    """
+    One question within `time_budget` seconds: (question, fingerprint), or an
+    "ERROR: ..." / "BUDGET: ..." string when generation failed or ran out of time.
+    """
+    try:
+        if category is not None:
+            # A category a worker has not served yet is imported here, before its question's budget starts
+            gen.category(category)
+        budget = Budget(max_seconds=time_budget) if time_budget is not None else None
+        return gen.generate_random_question(specific_category=category, with_fingerprint=True, budget=budget)
+    except BudgetExhausted as e:
+        return f"BUDGET: {str(e)}"
+    except Exception as e:
+        return f"ERROR: {str(e)}"
+
+
+# --- WORKER PROCESS (long-lived, one QuestionGenerator per process) ---
+def pool_worker_loop(task_queue, result_queue, resources_path, solver_cache_path=None,
+                     target_latency=0.2, cost_model_path=None, categories=None):
+    # The templates are loaded only once, when the worker starts, with the categories the pool was
+    # given explicitly; any other category is imported the first time the worker is asked for it
+    gen = QuestionGenerator(resources_path, solver_cache_path=solver_cache_path,
+                            target_latency=target_latency, cost_model_path=cost_model_path, categories=categories)
+    if categories:
+        gen.load_categories()
+    result_queue.put(('ready', None))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        task_id, category, time_budget = task
+        result_queue.put((task_id, run_task(gen, category, time_budget)))
+
+    # Only a worker that is stopped cleanly saves what it learned about instance costs (and its cache counters)
+    gen.close()
+# ---------------------------------------------------------------------
+
+
+class _WorkerSlot:
+    """One worker process together with its private task/result queues."""
+
+    def __init__(self, ctx, resources_path, worker_args=()):
+        self.task_queue = ctx.Queue()
+        self.result_queue = ctx.Queue()
+        self.process = ctx.Process(
+            target=pool_worker_loop,
+            args=(self.task_queue, self.result_queue, resources_path) + tuple(worker_args),
+            daemon=True
+        )
+        self.process.start()
+        self.ready = False
+
+    def wait_ready(self, timeout):
+        if self.ready:
+            return True
+        try:
+            self.result_queue.get(timeout=timeout)
+            self.ready = True
+        except queue.Empty:
+            pass
+        return self.ready
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+    def stop(self, timeout=1.0):
+        if self.process.is_alive():
+            try:
+                self.task_queue.put(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout)
+        self.kill()
+
+
+class GeneratorPool:
+    """
+    Long-lived pool of pre-initialized QuestionGenerators.
+
+    Each worker keeps its generator (and the loaded templates) across tasks.
+    A task's timeout is handed to the generator as a Budget, so the solvers stop
+    by themselves when it runs out and the task ends with None (counted in
+    `over_budget_tasks`).
+
+    mode='process' runs the workers as processes. Killing a worker is kept only
+    as a last resort, for a task still running `kill_grace` seconds after its
+    timeout; only that worker is replaced (`recycled_workers`). mode='thread'
+    runs the workers as threads of this process and never kills anything; the
+    threads share the GIL, so it suits few workers and light categories.
+
+    With a `solver_cache_path`, all workers share one SolverCache file, so the
+    results computed by a worker (even one killed later) are reused by the others.
+    Each worker sizes its instances to `target_latency` (see InstanceScheduler);
+    with a `cost_model_path`, the cost models are loaded from that file and every
+    worker adds its measurements to it when the pool is closed.
+
+    Process workers load the `categories` given to the pool while starting up;
+    any other category (all of them, if none are given) is imported the first
+    time a worker is asked for it, outside that question's budget.
+    """
+
+    def __init__(self, resources_path, num_workers=None, task_timeout=1.0, startup_timeout=10.0,
+                 solver_cache_path=None, mode='process', kill_grace=0.5, target_latency=0.2, cost_model_path=None,
+                 categories=None):
+        if mode not in ('process', 'thread'):
+            raise ValueError(f"Unknown pool mode '{mode}'")
+        if num_workers is None:
+            num_workers = max(1, min(4, (multiprocessing.cpu_count() or 2) - 1))
+
+        self.resources_path = resources_path
+        self.num_workers = num_workers
+        self.task_timeout = task_timeout
+        self.startup_timeout = startup_timeout
+        self.solver_cache_path = solver_cache_path
+        self.mode = mode
+        self.kill_grace = kill_grace
+        self.target_latency = target_latency
+        self.cost_model_path = cost_model_path
+        self.categories = list(categories) if categories else None
+        self._worker_args = (solver_cache_path, target_latency, cost_model_path, self.categories)
+        self._solver_cache = None
+
+        self.recycled_workers = 0
+        self.completed_tasks = 0
+        self.timed_out_tasks = 0
+        self.over_budget_tasks = 0
+
+        self._ctx = multiprocessing.get_context()
+        self._pending = queue.Queue()
+        self._task_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._slots = []
+        if mode == 'process':
+            self._slots = [_WorkerSlot(self._ctx, resources_path, self._worker_args) for _ in range(num_workers)]
+        self._threads = []
+        for idx in range(num_workers):
+            target = self._slot_loop if mode == 'process' else self._thread_loop
+            t = threading.Thread(target=target, args=(idx,), daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, category, timeout=None):
+        """
+        Queues one question for `category`. Returns a Future whose result is
+        (question, fingerprint), or None on timeout/error/exhausted budget.
+        """
+        if self._closed:
+            raise RuntimeError("GeneratorPool is closed")
+
+        fut = Future()
+        self._pending.put((fut, category, timeout if timeout is not None else self.task_timeout))
+        return fut
+
+    def generate(self, category, timeout=None):
+        """Blocking helper, same contract as the old `_generate_with_timeout`."""
+        return self.submit(category, timeout).result()
+
+    def stats(self):
+        """
+        Task counters, and the solver cache totals of all workers. The workers write
+        their cache counters in batches, so the totals are complete once the pool is closed.
+        """
+        with self._lock:
+            stats = {
+                'mode': self.mode,
+                'workers': self.num_workers,
+                'completed_tasks': self.completed_tasks,
+                'over_budget_tasks': self.over_budget_tasks,
+                'timed_out_tasks': self.timed_out_tasks,
+                'recycled_workers': self.recycled_workers,
+            }
+        if self.solver_cache_path:
+            # Hit/miss/eviction totals of all workers, read from the shared file
+            if self._solver_cache is None:
+                self._solver_cache = SolverCache(self.solver_cache_path)
+            stats['solver_cache'] = self._solver_cache.stats()
+        return stats
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+
+        for _ in self._threads:
+            self._pending.put(None)
+        for t in self._threads:
+            t.join(2.0)
+        for slot in self._slots:
+            slot.stop()
+        if self._solver_cache is not None:
+            self._solver_cache.close()
+
+    def _recycle(self, idx):
+        self._slots[idx].kill()
+        self._slots[idx] = _WorkerSlot(self._ctx, self.resources_path, self._worker_args)
+        with self._lock:
+            self.recycled_workers += 1
+
+    def _slot_loop(self, idx):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+
+            fut, category, timeout = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+
+            slot = self._slots[idx]
+            if not slot.wait_ready(self.startup_timeout):
+                print(f"Worker {idx} did not start in time, replacing it")
+                self._recycle(idx)
+                fut.set_result(None)
+                continue
+
+            task_id = next(self._task_ids)
+            slot.task_queue.put((task_id, category, timeout))
+
+            res = None
+            try:
+                while True:
+                    # The worker stops itself at `timeout`; the grace covers a step that does not check its budget
+                    got_id, payload = slot.result_queue.get(timeout=timeout + self.kill_grace)
+                    if got_id == task_id:
+                        res = payload
+                        break
+            except queue.Empty:
+                # Only the hung worker is killed, the others keep their state.
+                print(f"💀 Worker killed for category '{category}' (Timeout)")
+                with self._lock:
+                    self.timed_out_tasks += 1
+                self._recycle(idx)
+                fut.set_result(None)
+                continue
+
+            self._finish(fut, res)
+
+    def _thread_loop(self, idx):
+        gen = None
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+
+            fut, category, timeout = item
+            if not fut.set_running_or_notify_cancel():
+                continue
+
+            if gen is None:
+                gen = QuestionGenerator(self.resources_path, solver_cache_path=self.solver_cache_path,
+                                        target_latency=self.target_latency, cost_model_path=self.cost_model_path,
+                                        categories=self.categories)
+            self._finish(fut, run_task(gen, category, timeout))
+
+        if gen is not None:
+            gen.close()
+
+    def _finish(self, fut, res):
+        with self._lock:
+            self.completed_tasks += 1
+            if isinstance(res, str) and res.startswith("BUDGET:"):
+                self.over_budget_tasks += 1
+
+        if isinstance(res, str):
+            print(res)
+            res = None
+        fut.set_result(res)
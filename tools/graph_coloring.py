@@ -0,0 +1,166 @@
+import heapq
+import time
+
+
+def _popcount(x):
+    return bin(x).count('1')
+
+
+def color_graph(adj, k, ordering='dsatur', forward_checking=True, max_nodes=None, budget=None):
+    """
+    Backtracking search for a k-coloring of the graph `adj` (adj[v] = neighbors of v).
+
+    Every vertex keeps its domain as an integer bitmask of the colors not used by
+    its colored neighbors (per-color neighbor counts make undo exact). With
+    ordering='dsatur' the next vertex is the one with the fewest remaining colors
+    (highest saturation), ties broken by degree, found through a lazy heap;
+    ordering='static' colors the vertices in index order. With forward checking,
+    an assignment that empties an uncolored neighbor's domain is rejected at once.
+
+    Returns a dict with the coloring (or None), node/backtrack/wipeout counters,
+    whether the node budget (or the shared `budget`) ran out, and the elapsed time.
+    """
+    start_time = time.perf_counter()
+    n = len(adj)
+    full = (1 << k) - 1
+    domain = [full] * n
+    counts = [0] * (n * k)
+    color = [-1] * n
+    degree = [len(adj[v]) for v in range(n)]
+
+    heap = [(k, -degree[v], v) for v in range(n)]
+    heapq.heapify(heap)
+
+    nodes = 0
+    backtracks = 0
+    wipeouts = 0
+    colored = 0
+    exhausted = False
+
+    def select(depth):
+        if ordering == 'static':
+            return depth
+        while heap:
+            size, _, v = heapq.heappop(heap)
+            if color[v] == -1 and size == _popcount(domain[v]):
+                return v
+        raise RuntimeError("no uncolored vertex left")
+
+    def assign(v, c):
+        color[v] = c
+        wiped = False
+        bit = 1 << c
+        for u in adj[v]:
+            idx = u * k + c
+            counts[idx] += 1
+            if counts[idx] == 1:
+                domain[u] &= ~bit
+                if color[u] == -1:
+                    if ordering == 'dsatur':
+                        heapq.heappush(heap, (_popcount(domain[u]), -degree[u], u))
+                    if not domain[u]:
+                        wiped = True
+        return wiped
+
+    def unassign(v, c):
+        color[v] = -1
+        bit = 1 << c
+        for u in adj[v]:
+            idx = u * k + c
+            counts[idx] -= 1
+            if counts[idx] == 0:
+                domain[u] |= bit
+                if color[u] == -1 and ordering == 'dsatur':
+                    heapq.heappush(heap, (_popcount(domain[u]), -degree[u], u))
+
+    solved = n == 0
+    stack = []
+    if n:
+        v = select(0)
+        stack.append([v, domain[v], -1])
+
+    while stack:
+        frame = stack[-1]
+        v, remaining, current = frame
+        if current != -1:
+            unassign(v, current)
+            colored -= 1
+            frame[2] = -1
+
+        if not remaining:
+            stack.pop()
+            backtracks += 1
+            if ordering == 'dsatur':
+                heapq.heappush(heap, (_popcount(domain[v]), -degree[v], v))
+            continue
+
+        if (max_nodes is not None and nodes >= max_nodes) or (budget is not None and not budget.spend()):
+            exhausted = True
+            break
+
+        low = remaining & -remaining
+        c = low.bit_length() - 1
+        frame[1] = remaining & ~low
+        nodes += 1
+
+        wiped = assign(v, c)
+        colored += 1
+        frame[2] = c
+
+        if forward_checking and wiped:
+            wipeouts += 1
+            continue
+
+        if colored == n:
+            solved = True
+            break
+
+        nv = select(len(stack))
+        stack.append([nv, domain[nv], -1])
+
+    return {
+        'solved': solved,
+        'coloring': list(color) if solved else None,
+        'nodes': nodes,
+        'backtracks': backtracks,
+        'wipeouts': wipeouts,
+        'budget_exhausted': exhausted,
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+def dsatur_greedy(adj, budget=None):
+    """
+    Plain DSATUR (no backtracking): with max degree + 1 colors a free color always
+    exists. `colors_used` is None if the shared `budget` ran out first.
+    """
+    max_degree = max((len(adj[v]) for v in range(len(adj))), default=0)
+    result = color_graph(adj, max_degree + 1, ordering='dsatur', forward_checking=False, budget=budget)
+    result['colors_used'] = max(result['coloring'], default=-1) + 1 if result['solved'] else None
+    return result
+
+
+def chromatic_number(adj, max_nodes=None, budget=None):
+    """
+    Smallest k for which DSATUR + forward checking finds a coloring, starting from
+    the greedy bound and going down. Returns (k, proven, coloring); `proven` is
+    False when the node budget ran out before k - 1 was ruled out. If the shared
+    `budget` runs out during the greedy pass, k and coloring are None.
+    """
+    greedy = dsatur_greedy(adj, budget)
+    best_k = greedy['colors_used']
+    best_coloring = greedy['coloring']
+    if best_k is None:
+        return None, False, None
+
+    k = best_k - 1
+    while k >= 1:
+        result = color_graph(adj, k, max_nodes=max_nodes, budget=budget)
+        if result['budget_exhausted']:
+            return best_k, False, best_coloring
+        if not result['solved']:
+            break
+        best_k, best_coloring = k, result['coloring']
+        k -= 1
+
+    return best_k, True, best_coloring
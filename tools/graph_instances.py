@@ -0,0 +1,101 @@
+import math
+import random
+from array import array
+
+
+class CSRGraph:
+    """
+    Undirected graph in compressed sparse row form.
+
+    The neighbors of vertex v are indices[indptr[v]:indptr[v + 1]]; both arrays are
+    flat int arrays, so a graph with m edges costs about 8 * (n + 2m) bytes.
+    `graph[v]` returns a zero-copy view of v's neighbors and `len(graph)` is n,
+    so solvers written against adjacency lists accept it unchanged.
+    """
+
+    def __init__(self, n, indptr, indices):
+        self.n = n
+        self.indptr = indptr
+        self.indices = indices
+        self._view = memoryview(indices)
+
+    @classmethod
+    def from_edges(cls, n, sources, targets):
+        degree = array('i', [0]) * n
+        for u, v in zip(sources, targets):
+            degree[u] += 1
+            degree[v] += 1
+
+        indptr = array('i', [0]) * (n + 1)
+        for v in range(n):
+            indptr[v + 1] = indptr[v] + degree[v]
+
+        indices = array('i', [0]) * indptr[n]
+        fill = array('i', indptr[:n])
+        for u, v in zip(sources, targets):
+            indices[fill[u]] = v
+            fill[u] += 1
+            indices[fill[v]] = u
+            fill[v] += 1
+
+        return cls(n, indptr, indices)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, v):
+        return self._view[self.indptr[v]:self.indptr[v + 1]]
+
+    def degree(self, v):
+        return self.indptr[v + 1] - self.indptr[v]
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    def edges(self):
+        """Each edge once, as (u, v) with u < v."""
+        for u in range(self.n):
+            for v in self[u]:
+                if u < v:
+                    yield u, v
+
+
+def sample_gnp(n, p, rng=None):
+    """
+    Erdős–Rényi G(n, p) in expected O(n + m) time (Batagelj & Brandes).
+
+    Instead of flipping a coin for each of the n(n-1)/2 pairs, the gap to the next
+    edge in the row-major pair order is drawn from a geometric distribution.
+    """
+    if rng is None:
+        rng = random.Random()
+
+    sources = array('i')
+    targets = array('i')
+
+    if p >= 1:
+        for v in range(1, n):
+            for w in range(v):
+                sources.append(v)
+                targets.append(w)
+    elif p > 0:
+        log_q = math.log(1.0 - p)
+        v, w = 1, -1
+        while v < n:
+            w += 1 + int(math.log(1.0 - rng.random()) / log_q)
+            while w >= v and v < n:
+                w -= v
+                v += 1
+            if v < n:
+                sources.append(v)
+                targets.append(w)
+
+    return CSRGraph.from_edges(n, sources, targets)
+
+
+def variable_name(v, n):
+    """Letters A..Z for small instances, X0, X1, ... once there are more than 26 variables."""
+    if n <= 26:
+        return chr(ord('A') + v)
+    return f"X{v}"
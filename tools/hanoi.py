@@ -0,0 +1,335 @@
+import heapq
+import mmap
+import os
+import threading
+import time
+
+
+# Disks per pattern-database group for each peg count (table size = 2^(bits * disks) bytes)
+PDB_GROUP_SIZES = {4: 8, 5: 6}
+
+
+# Frame–Stewart move counts, _frame_stewart[pegs][n]; filled bottom-up once and reused
+_frame_stewart = {}
+_frame_stewart_lock = threading.Lock()
+
+
+def frame_stewart(n_disks, pegs=3):
+    """
+    Minimum number of moves for n disks on `pegs` pegs (Frame–Stewart).
+
+    FS(n, 3) = 2^n - 1 and FS(n, k) = min over t of 2 * FS(t, k) + FS(n - t, k - 1):
+    move t disks aside using every peg, the rest with one peg fewer, then the t
+    disks back on top. The table is memoized per peg count and only extended
+    when a larger n is asked for.
+    """
+    if pegs < 3:
+        raise ValueError("Hanoi needs at least 3 pegs")
+
+    with _frame_stewart_lock:
+        table = _frame_stewart.get(pegs)
+        if table is not None and len(table) > n_disks:
+            return table[n_disks]
+
+        for k in range(3, pegs + 1):
+            row = _frame_stewart.setdefault(k, [0])
+            for m in range(len(row), n_disks + 1):
+                if k == 3:
+                    row.append(2 ** m - 1)
+                else:
+                    below = _frame_stewart[k - 1]
+                    row.append(min(2 * row[t] + below[m - t] for t in range(m)))
+
+        return _frame_stewart[pegs][n_disks]
+
+
+class HanoiProblem:
+    """
+    Towers of Hanoi state space with every state packed into one integer.
+
+    Disk d (0 = smallest) stores its peg in a fixed-width bit field starting at
+    bit `bits * d`. The disks on a peg are extracted for all disks at once with
+    masks, the top disk of a peg is the lowest set bit of that mask and a move is
+    a single addition, so no tuples or lists are built during the search.
+    """
+
+    def __init__(self, n_disks, pegs=3, goal_peg=None):
+        self.n_disks = n_disks
+        self.pegs = pegs
+        self.goal_peg = pegs - 1 if goal_peg is None else goal_peg
+        self.bits = max(1, (pegs - 1).bit_length())
+
+        # LOW has the lowest bit of every disk field set
+        self.low = sum(1 << (self.bits * d) for d in range(n_disks))
+        self.field_mask = (1 << self.bits) - 1
+        self.replicated = [p * self.low for p in range(pegs)]
+
+        self.start = 0
+        self.goal = self.replicated[self.goal_peg]
+
+    def peg_masks(self, state):
+        """For every peg, the low bits of the fields of the disks sitting on it."""
+        masks = []
+        for p in range(self.pegs):
+            x = state ^ self.replicated[p]
+            # A field is zero (disk on peg p) only if none of its bits is set
+            diff = x
+            for b in range(1, self.bits):
+                diff |= x >> b
+            masks.append(~diff & self.low)
+        return masks
+
+    def neighbors(self, state):
+        masks = self.peg_masks(state)
+        tops = [m & -m for m in masks]
+
+        for src in range(self.pegs):
+            top_src = tops[src]
+            if not top_src:
+                continue
+            for dst in range(self.pegs):
+                if dst == src:
+                    continue
+                top_dst = tops[dst]
+                # Field positions grow with disk size, so comparing the bits compares the disks
+                if not top_dst or top_src < top_dst:
+                    yield state + ((dst - src) * top_src)
+
+    def misplaced_disks(self, state):
+        """The old heuristic: disks not yet on the goal peg."""
+        return self.n_disks - bin(self.peg_masks(state)[self.goal_peg]).count('1')
+
+    def lower_bound(self, state):
+        """
+        Admissible for any number of pegs: every misplaced disk moves at least once,
+        and a disk already on the goal peg but smaller than the largest misplaced
+        disk must leave it and come back (two moves).
+        """
+        masks = self.peg_masks(state)
+        on_goal = masks[self.goal_peg]
+        misplaced = self.low & ~on_goal
+        if not misplaced:
+            return 0
+
+        largest_misplaced = 1 << (misplaced.bit_length() - 1)
+        in_the_way = on_goal & (largest_misplaced - 1)
+        return bin(misplaced).count('1') + 2 * bin(in_the_way).count('1')
+
+    def three_peg_distance(self, state):
+        """
+        Exact number of moves to gather every disk on the goal peg (3 pegs only).
+
+        Walking from the largest disk down: a disk already on the current target
+        costs nothing, otherwise it must move once (2^d moves for it and the disks
+        above it) and the smaller disks must first gather on the third peg.
+        """
+        target = self.goal_peg
+        dist = 0
+        for d in range(self.n_disks - 1, -1, -1):
+            p = (state >> (self.bits * d)) & self.field_mask
+            if p != target:
+                dist += 1 << d
+                target = 3 - p - target
+        return dist
+
+
+def astar_hanoi(problem, heuristic=None, max_expansions=None, budget=None):
+    """
+    A* from the start tower to the goal tower, with a closed set.
+
+    Ties on f are broken towards deeper nodes. Every expansion is charged to the
+    shared `budget` (a tools.budget.Budget), if given. Returns a dict with the
+    solution length, expanded/generated node counts, the peak open-list size,
+    whether the shared budget ran out, and the time.
+    """
+    if heuristic is None:
+        heuristic = problem.three_peg_distance if problem.pegs == 3 else problem.lower_bound
+
+    start_time = time.perf_counter()
+    start, goal = problem.start, problem.goal
+
+    open_set = [(heuristic(start), 0, start)]
+    g_score = {start: 0}
+    closed = set()
+    expanded = 0
+    generated = 1
+    peak_open = 1
+    steps = None
+    exhausted = False
+
+    while open_set:
+        _, neg_g, state = heapq.heappop(open_set)
+        if state in closed:
+            continue
+        g = -neg_g
+
+        if state == goal:
+            steps = g
+            break
+
+        closed.add(state)
+        del g_score[state]
+        expanded += 1
+        if max_expansions is not None and expanded >= max_expansions:
+            break
+        if budget is not None and not budget.spend():
+            exhausted = True
+            break
+
+        ng = g + 1
+        for neighbor in problem.neighbors(state):
+            if neighbor in closed or ng >= g_score.get(neighbor, ng + 1):
+                continue
+            g_score[neighbor] = ng
+            heapq.heappush(open_set, (ng + heuristic(neighbor), -ng, neighbor))
+            generated += 1
+
+        if len(open_set) > peak_open:
+            peak_open = len(open_set)
+
+    return {
+        'solved': steps is not None,
+        'steps': steps,
+        'expanded': expanded,
+        'generated': generated,
+        'peak_open': peak_open,
+        'budget_exhausted': exhausted,
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+class PatternDatabase:
+    """
+    Exact distances for every placement of `group_size` disks on `pegs` pegs.
+
+    Only the relative order of the disks in a group matters, so one table per
+    (pegs, group_size) serves every disk group. Entries are indexed by the packed
+    bit fields of the group (the same layout as HanoiProblem states), one byte per
+    entry, and the file is memory-mapped so all worker processes share the pages.
+    """
+
+    UNREACHABLE = 255
+
+    def __init__(self, pegs, group_size, table):
+        self.pegs = pegs
+        self.group_size = group_size
+        self.bits = max(1, (pegs - 1).bit_length())
+        self.table = table
+
+    @staticmethod
+    def file_name(pegs, group_size):
+        return f"hanoi_pdb_p{pegs}_d{group_size}.bin"
+
+    @classmethod
+    def build(cls, pegs, group_size):
+        """Backward BFS from the tower on the last peg (moves are reversible)."""
+        problem = HanoiProblem(group_size, pegs)
+        table = bytearray([cls.UNREACHABLE]) * (1 << (problem.bits * group_size))
+
+        table[problem.goal] = 0
+        frontier = [problem.goal]
+        depth = 0
+        while frontier:
+            depth += 1
+            if depth >= cls.UNREACHABLE:
+                raise ValueError(f"Distances for {group_size} disks on {pegs} pegs do not fit in one byte")
+            next_frontier = []
+            for state in frontier:
+                for neighbor in problem.neighbors(state):
+                    if table[neighbor] == cls.UNREACHABLE:
+                        table[neighbor] = depth
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        return cls(pegs, group_size, table)
+
+    def save(self, path):
+        # Written to a temp file first so concurrent readers never map a partial table
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(self.table)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, pegs, group_size):
+        with open(path, 'rb') as file:
+            table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        expected = 1 << (max(1, (pegs - 1).bit_length()) * group_size)
+        if len(table) != expected:
+            table.close()
+            raise ValueError(f"{path} has {len(table)} entries, expected {expected}")
+        return cls(pegs, group_size, table)
+
+
+_pattern_databases = {}
+
+
+def load_pattern_database(resources_path, pegs, group_size):
+    """Maps the table from resources (building and saving it first if it is missing), once per process."""
+    key = (resources_path, pegs, group_size)
+    pdb = _pattern_databases.get(key)
+    if pdb is None:
+        path = os.path.join(resources_path, PatternDatabase.file_name(pegs, group_size))
+        if not os.path.exists(path):
+            PatternDatabase.build(pegs, group_size).save(path)
+        pdb = PatternDatabase.load(path, pegs, group_size)
+        _pattern_databases[key] = pdb
+    return pdb
+
+
+class PatternDatabaseHeuristic:
+    """
+    Additive heuristic: the disks are split into disjoint groups of at most
+    `pdb.group_size` consecutive disks and the group distances are summed. Every
+    move moves one disk of one group, so the sum stays admissible.
+
+    A smaller group (the smallest disks) is looked up as if the missing larger
+    disks were already at the bottom of the goal peg, where they never move.
+    """
+
+    def __init__(self, problem, pdb):
+        if pdb.pegs != problem.pegs:
+            raise ValueError("Pattern database and problem use different peg counts")
+
+        self.table = pdb.table
+        bits = problem.bits
+        goal_field = problem.goal_peg
+        self.groups = []
+
+        hi = problem.n_disks
+        while hi > 0:
+            lo = max(0, hi - pdb.group_size)
+            size = hi - lo
+            mask = (1 << (bits * size)) - 1
+            padding = 0
+            for d in range(size, pdb.group_size):
+                padding |= goal_field << (bits * d)
+            self.groups.append((bits * lo, mask, padding))
+            hi = lo
+
+    def __call__(self, state):
+        table = self.table
+        h = 0
+        for shift, mask, padding in self.groups:
+            h += table[((state >> shift) & mask) | padding]
+        return h
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build Hanoi pattern databases into the resources folder.")
+    parser.add_argument('--pegs', type=int, nargs='+', default=[4, 5])
+    parser.add_argument('--group-size', type=int, default=None,
+                        help="disks per pattern (default: the size used by the quiz for each peg count)")
+    parser.add_argument('--resources', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources'))
+    args = parser.parse_args()
+
+    for pegs in args.pegs:
+        group_size = args.group_size or PDB_GROUP_SIZES[pegs]
+        start = time.perf_counter()
+        pdb = PatternDatabase.build(pegs, group_size)
+        path = os.path.join(args.resources, PatternDatabase.file_name(pegs, group_size))
+        pdb.save(path)
+        print(f"{path}: {len(pdb.table)} bytes in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,217 @@
+import json
+import math
+import os
+import time
+from collections import deque
+
+
+# z-score of the 99th percentile of a normal distribution
+Z_P99 = 2.326
+
+
+class CostModel:
+    """
+    Generation times of one knob (a family of instance sizes), as log-seconds.
+
+    Every option keeps a sliding window of its own measurements; an option with
+    at least `min_samples` of them is predicted from its own log-normal fit. The
+    others are predicted by a least-squares fit of log-time against log-size over
+    all measurements of the knob (cost ~ a * size^b), widened by the spread of
+    the residuals, so a size never tried can still be judged too expensive.
+    """
+
+    def __init__(self, window=64, min_samples=5):
+        self.window = window
+        self.min_samples = min_samples
+        self.options = {}  # option key -> (size, deque of log-seconds)
+
+    def record(self, key, size, seconds):
+        entry = self.options.get(key)
+        if entry is None:
+            entry = self.options[key] = (size, deque(maxlen=self.window))
+        entry[1].append(math.log(max(seconds, 1e-6)))
+
+    def p99(self, key, size):
+        """Predicted 99th-percentile time in seconds, or None if nothing supports a prediction yet."""
+        entry = self.options.get(key)
+        if entry is not None and len(entry[1]) >= self.min_samples:
+            mean, std = _mean_std(entry[1])
+            return math.exp(mean + Z_P99 * std)
+        return self._extrapolate(size)
+
+    def _extrapolate(self, size):
+        points = [(math.log(s), t) for s, times in self.options.values() for t in times]
+        if len({x for x, _ in points}) < 2:
+            return None
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        sxx = sum((x - mean_x) ** 2 for x, _ in points)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+        intercept = mean_y - slope * mean_x
+        residuals = [y - (intercept + slope * x) for x, y in points]
+        _, std = _mean_std(residuals)
+        return math.exp(intercept + slope * math.log(size) + Z_P99 * std)
+
+    def to_dict(self):
+        return {key: {'size': size, 'log_times': list(times)} for key, (size, times) in self.options.items()}
+
+    @classmethod
+    def from_dict(cls, data, window=64, min_samples=5):
+        model = cls(window, min_samples)
+        for key, entry in data.items():
+            model.options[key] = (entry['size'], deque(entry['log_times'], maxlen=window))
+        return model
+
+
+def _mean_std(values):
+    values = list(values)
+    mean = sum(values) / len(values)
+    variance = sum((v - mean) ** 2 for v in values) / max(1, len(values) - 1)
+    return mean, math.sqrt(variance)
+
+
+class InstanceScheduler:
+    """
+    Picks instance sizes that fit a latency target, from measured generation times.
+
+    `choose` gets the options of a knob cheapest first, each with a numeric size
+    (the cost feature of the model). An option is feasible when its predicted p99
+    is within `target_latency`; an option with no prediction yet is tried only
+    right after a feasible one, so the sizes grow step by step. The largest
+    feasible option is taken with probability `prefer_largest`, otherwise any
+    feasible option, so questions stay varied. With probability `explore`, the
+    first infeasible option is tried again, so faster hardware is noticed.
+
+    The models can be saved to a JSON file and loaded by the next session. Several
+    processes may share the file: each save adds only the measurements taken
+    since the last one to what the file holds, under a lock.
+    """
+
+    def __init__(self, target_latency=0.2, path=None, prefer_largest=0.5, explore=0.02, window=64, min_samples=5):
+        self.target_latency = target_latency
+        self.path = path
+        self.prefer_largest = prefer_largest
+        self.explore = explore
+        self.window = window
+        self.min_samples = min_samples
+        self.models = {}
+        # Measurements not saved yet: (knob, option key, size, seconds)
+        self._unsaved = []
+
+    @classmethod
+    def open(cls, path, target_latency=0.2, **kwargs):
+        """The scheduler saved at `path`, or a fresh one that will be saved there."""
+        scheduler = cls(target_latency, path, **kwargs)
+        scheduler.models = scheduler._load(path)
+        return scheduler
+
+    def _load(self, path):
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return {knob: CostModel.from_dict(options, self.window, self.min_samples)
+                    for knob, options in data.items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            print(f"Ignoring unreadable cost model file {path}")
+            return {}
+
+    def _model(self, knob):
+        model = self.models.get(knob)
+        if model is None:
+            model = self.models[knob] = CostModel(self.window, self.min_samples)
+        return model
+
+    def choose(self, knob, options, rng):
+        """One option from `options` (a list of (option, size) pairs, cheapest first)."""
+        model = self._model(knob)
+        feasible = []
+        blocked = None
+        previous_feasible = True
+        for option, size in options:
+            p99 = model.p99(str(option), size)
+            if p99 is None:
+                fits = previous_feasible
+            else:
+                fits = p99 <= self.target_latency
+            if fits:
+                feasible.append(option)
+            elif blocked is None:
+                blocked = option
+            previous_feasible = fits and p99 is not None
+
+        if blocked is not None and rng.random() < self.explore:
+            return blocked
+        if not feasible:
+            # Even the smallest size is too slow: it is still the best choice
+            return options[0][0]
+        if rng.random() < self.prefer_largest:
+            return feasible[-1]
+        return rng.choice(feasible)
+
+    def record(self, knob, option, size, seconds):
+        self._model(knob).record(str(option), size, seconds)
+        self._unsaved.append((knob, str(option), size, seconds))
+
+    def save(self, path=None):
+        """
+        Adds the measurements taken since the last save to the models in `path`.
+
+        Other processes may have saved their own since this one loaded the file, so
+        the file is read again under the lock and only the new measurements are
+        added to it; the merged models then replace this scheduler's.
+        """
+        path = path or self.path
+        if path is None or not self._unsaved:
+            return
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with _FileLock(path + '.lock'):
+            models = self._load(path)
+            for knob, key, size, seconds in self._unsaved:
+                model = models.get(knob)
+                if model is None:
+                    model = models[knob] = CostModel(self.window, self.min_samples)
+                model.record(key, size, seconds)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({knob: model.to_dict() for knob, model in models.items()}, file)
+            os.replace(tmp_path, path)
+        self.models = models
+        self._unsaved = []
+
+
+class _FileLock:
+    """
+    Exclusive lock between processes, held while the file `path` exists (creating
+    it with O_EXCL is atomic on every platform). A lock older than `stale` seconds
+    was left by a process that died holding it and is broken.
+    """
+
+    def __init__(self, path, stale=30.0, poll=0.01):
+        self.path = path
+        self.stale = stale
+        self.poll = poll
+
+    def __enter__(self):
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    # Released (or broken by another process) in the meantime
+                    continue
+                time.sleep(self.poll)
+
+    def __exit__(self, *exc_info):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
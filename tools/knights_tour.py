@@ -0,0 +1,170 @@
+import time
+from array import array
+
+
+KNIGHT_MOVES = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+
+_move_tables = {}
+
+
+def move_table(n):
+    """
+    Precomputed knight moves for an n x n board, cached per size.
+
+    Returns (neighbors, offsets): the neighbors of square sq (= row * n + col) are
+    neighbors[offsets[sq]:offsets[sq + 1]], all stored in one flat int array.
+    """
+    tables = _move_tables.get(n)
+    if tables is None:
+        neighbors = array('i')
+        offsets = array('i', [0])
+        for sq in range(n * n):
+            r, c = divmod(sq, n)
+            for dr, dc in KNIGHT_MOVES:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < n and 0 <= nc < n:
+                    neighbors.append(nr * n + nc)
+            offsets.append(len(neighbors))
+        tables = (neighbors, offsets)
+        _move_tables[n] = tables
+    return tables
+
+
+class KnightsTourBoard:
+    """
+    Search state: an occupancy bitboard (one bit per square, packed in a bytearray)
+    and, for every square, the number of unvisited squares a knight can reach from
+    it. Visiting or un-visiting a square updates only its own neighbors' degrees.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.neighbors, self.offsets = move_table(n)
+        self.visited = bytearray((n * n + 7) // 8)
+        self.degree = array('i', (self.offsets[sq + 1] - self.offsets[sq] for sq in range(n * n)))
+
+        # Tie-break key: squares far from the centre first (Roth's rule), measured in doubled coordinates
+        center = n - 1
+        self.center_dist = array('i', ((2 * (sq // n) - center) ** 2 + (2 * (sq % n) - center) ** 2
+                                       for sq in range(n * n)))
+
+    def is_visited(self, sq):
+        return self.visited[sq >> 3] & (1 << (sq & 7))
+
+    def visit(self, sq):
+        self.visited[sq >> 3] |= 1 << (sq & 7)
+        degree = self.degree
+        for i in range(self.offsets[sq], self.offsets[sq + 1]):
+            degree[self.neighbors[i]] -= 1
+
+    def unvisit(self, sq):
+        self.visited[sq >> 3] &= ~(1 << (sq & 7)) & 0xFF
+        degree = self.degree
+        for i in range(self.offsets[sq], self.offsets[sq + 1]):
+            degree[self.neighbors[i]] += 1
+
+    def ordered_moves(self, sq):
+        """Unvisited neighbors, Warnsdorff order: fewest onward moves, then farthest from the centre."""
+        moves = []
+        for i in range(self.offsets[sq], self.offsets[sq + 1]):
+            nb = self.neighbors[i]
+            if not self.visited[nb >> 3] & (1 << (nb & 7)):
+                moves.append((self.degree[nb], -self.center_dist[nb], nb))
+        moves.sort()
+        return [nb for _, _, nb in moves]
+
+
+def warnsdorff_tour(n, start):
+    """Pure Warnsdorff: always jump to the best-ranked square, never undo a move."""
+    start_time = time.perf_counter()
+    board = KnightsTourBoard(n)
+    path = [start]
+    board.visit(start)
+
+    sq = start
+    while len(path) < n * n:
+        moves = board.ordered_moves(sq)
+        if not moves:
+            break
+        sq = moves[0]
+        board.visit(sq)
+        path.append(sq)
+
+    return {
+        'complete': len(path) == n * n,
+        'path': path,
+        'nodes': len(path),
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+def backtracking_tour(n, start, max_nodes=200000, budget=None):
+    """
+    Depth-first search in Warnsdorff order with an explicit stack (no recursion
+    limit). Stops after `max_nodes` visited squares, or when the shared `budget`
+    runs out.
+    """
+    start_time = time.perf_counter()
+    board = KnightsTourBoard(n)
+    board.visit(start)
+    path = [start]
+    stack = [board.ordered_moves(start)]
+    nodes = 1
+    backtracks = 0
+    exhausted = False
+
+    while path and len(path) < n * n:
+        candidates = stack[-1]
+        if not candidates:
+            board.unvisit(path.pop())
+            stack.pop()
+            backtracks += 1
+            continue
+
+        if nodes >= max_nodes or (budget is not None and not budget.spend()):
+            exhausted = True
+            break
+
+        sq = candidates.pop(0)
+        board.visit(sq)
+        path.append(sq)
+        stack.append(board.ordered_moves(sq))
+        nodes += 1
+
+    return {
+        'complete': len(path) == n * n,
+        'path': path,
+        'nodes': nodes,
+        'backtracks': backtracks,
+        'budget_exhausted': exhausted,
+        'elapsed': time.perf_counter() - start_time,
+    }
+
+
+def solve_knights_tour(n, start, max_backtrack_nodes=200000, budget=None):
+    """Warnsdorff first; if it dead-ends, backtracking on a node budget (and the shared `budget`, if given)."""
+    greedy = warnsdorff_tour(n, start)
+    result = {
+        'complete': greedy['complete'],
+        'path': greedy['path'],
+        'method': 'warnsdorff',
+        'warnsdorff_length': len(greedy['path']),
+        'nodes': greedy['nodes'],
+        'backtracks': 0,
+        'budget_exhausted': False,
+        'elapsed': greedy['elapsed'],
+    }
+    if greedy['complete']:
+        return result
+
+    fallback = backtracking_tour(n, start, max_backtrack_nodes, budget)
+    result.update(
+        complete=fallback['complete'],
+        path=fallback['path'] if fallback['complete'] else greedy['path'],
+        method='backtracking',
+        nodes=greedy['nodes'] + fallback['nodes'],
+        backtracks=fallback['backtracks'],
+        budget_exhausted=fallback['budget_exhausted'],
+        elapsed=greedy['elapsed'] + fallback['elapsed'],
+    )
+    return result
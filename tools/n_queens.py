@@ -0,0 +1,148 @@
+import random
+import time
+
+
+class NQueensBoard:
+    """
+    N-Queens state with one queen per column (rows[col] = row).
+
+    Queens are counted per row, per diagonal (row - col) and per anti-diagonal
+    (row + col), so the conflicts of any square are an O(1) lookup and moving a
+    queen is an O(1) update. `attacking_pairs` is kept up to date incrementally.
+    """
+
+    def __init__(self, rows):
+        self.n = len(rows)
+        self.rows = list(rows)
+        self.row_count = [0] * self.n
+        self.diag_count = [0] * (2 * self.n - 1)
+        self.anti_count = [0] * (2 * self.n - 1)
+        self.attacking_pairs = 0
+
+        for col, row in enumerate(self.rows):
+            self._add(col, row)
+
+    def _add(self, col, row):
+        d = row - col + self.n - 1
+        a = row + col
+        self.attacking_pairs += self.row_count[row] + self.diag_count[d] + self.anti_count[a]
+        self.row_count[row] += 1
+        self.diag_count[d] += 1
+        self.anti_count[a] += 1
+
+    def _remove(self, col, row):
+        d = row - col + self.n - 1
+        a = row + col
+        self.row_count[row] -= 1
+        self.diag_count[d] -= 1
+        self.anti_count[a] -= 1
+        self.attacking_pairs -= self.row_count[row] + self.diag_count[d] + self.anti_count[a]
+
+    def conflicts_at(self, col, row):
+        """Queens (other than the one in `col`) attacking square (col, row)."""
+        c = self.row_count[row] + self.diag_count[row - col + self.n - 1] + self.anti_count[row + col]
+        if self.rows[col] == row:
+            c -= 3
+        return c
+
+    def move(self, col, row):
+        self._remove(col, self.rows[col])
+        self.rows[col] = row
+        self._add(col, row)
+
+
+def greedy_permutation(n, rng, tries=32):
+    """
+    Start state for large boards: a permutation (no row conflicts) built column
+    by column, preferring free rows that no placed queen attacks diagonally.
+    """
+    free_rows = list(range(n))
+    diag_used = [False] * (2 * n - 1)
+    anti_used = [False] * (2 * n - 1)
+    rows = [0] * n
+
+    for col in range(n):
+        best_idx = None
+        for _ in range(min(tries, len(free_rows))):
+            idx = rng.randrange(len(free_rows))
+            r = free_rows[idx]
+            if not diag_used[r - col + n - 1] and not anti_used[r + col]:
+                best_idx = idx
+                break
+        if best_idx is None:
+            best_idx = rng.randrange(len(free_rows))
+
+        row = free_rows[best_idx]
+        free_rows[best_idx] = free_rows[-1]
+        free_rows.pop()
+
+        rows[col] = row
+        diag_used[row - col + n - 1] = True
+        anti_used[row + col] = True
+
+    return rows
+
+
+def min_conflicts(rows, rng=None, max_steps=None, budget=None):
+    """
+    Runs Min-Conflicts from `rows` until no queen is attacked, `max_steps` moves
+    are made or the shared `budget` runs out.
+
+    Each step picks a random conflicted column and moves its queen to the row with
+    the fewest conflicts (random tie-break), which costs O(n) with the counters.
+    The conflicted column is found by sampling: with k conflicted queens that takes
+    O(n / k) lookups, never more than the row scan itself.
+    """
+    if rng is None:
+        rng = random.Random()
+
+    start = time.perf_counter()
+    board = NQueensBoard(rows)
+    n = board.n
+    if max_steps is None:
+        max_steps = 50 * n
+    initial_pairs = board.attacking_pairs
+
+    steps = 0
+    exhausted = False
+    while board.attacking_pairs > 0 and steps < max_steps:
+        if budget is not None and not budget.spend():
+            exhausted = True
+            break
+        col = rng.randrange(n)
+        for _ in range(4 * n):
+            if board.conflicts_at(col, board.rows[col]) > 0:
+                break
+            col = rng.randrange(n)
+        else:
+            col = next(c for c in range(n) if board.conflicts_at(c, board.rows[c]) > 0)
+
+        best_rows = []
+        best_conf = n * 3
+        row_count = board.row_count
+        diag_count = board.diag_count
+        anti_count = board.anti_count
+        current = board.rows[col]
+        offset = n - 1 - col
+        for r in range(n):
+            c = row_count[r] + diag_count[r + offset] + anti_count[r + col]
+            if r == current:
+                c -= 3
+            if c < best_conf:
+                best_conf = c
+                best_rows = [r]
+            elif c == best_conf:
+                best_rows.append(r)
+
+        board.move(col, rng.choice(best_rows))
+        steps += 1
+
+    return {
+        'solved': board.attacking_pairs == 0,
+        'steps': steps,
+        'initial_conflicts': initial_pairs,
+        'final_conflicts': board.attacking_pairs,
+        'budget_exhausted': exhausted,
+        'elapsed': time.perf_counter() - start,
+        'rows': board.rows,
+    }
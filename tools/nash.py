@@ -0,0 +1,295 @@
+import hashlib
+import itertools
+import random
+import time
+from collections import OrderedDict
+from fractions import Fraction
+
+import numpy as np
+
+
+def random_games(count, rows, cols, rng=None, low=-5, high=10):
+    """
+    `count` random bimatrix games in one array of shape (count, rows, cols, 2);
+    [..., 0] is player A's (row player) payoff and [..., 1] player B's.
+    """
+    if rng is None:
+        rng = random.Random()
+    generator = np.random.default_rng(rng.getrandbits(64))
+    return generator.integers(low, high, size=(count, rows, cols, 2), endpoint=True, dtype=np.int16)
+
+
+def pure_nash_mask(payoffs):
+    """
+    Boolean mask of the pure Nash equilibria, for one game (rows, cols, 2) or a
+    batch (count, rows, cols, 2).
+
+    A cell is a best response for A if its payoff is the maximum of its column,
+    and for B if it is the maximum of its row; equilibria are the cells that are
+    both (ties count as best responses).
+    """
+    payoffs = np.asarray(payoffs)
+    a, b = payoffs[..., 0], payoffs[..., 1]
+    best_a = a == a.max(axis=-2, keepdims=True)
+    best_b = b == b.max(axis=-1, keepdims=True)
+    return best_a & best_b
+
+
+def best_alternatives(payoffs, row, col):
+    """Best payoff A could get by changing row, and B by changing column (None for a single strategy)."""
+    payoffs = np.asarray(payoffs)
+    other_rows = np.delete(payoffs[:, col, 0], row)
+    other_cols = np.delete(payoffs[row, :, 1], col)
+    alt_a = int(other_rows.max()) if other_rows.size else None
+    alt_b = int(other_cols.max()) if other_cols.size else None
+    return alt_a, alt_b
+
+
+# --- MIXED EQUILIBRIA ---
+
+def _as_fractions(matrix):
+    return [[Fraction(int(v)) for v in row] for row in matrix]
+
+
+def _solve_indifference(M, support_rows, support_cols):
+    """
+    Mix over `support_cols` that makes every row of `support_rows` earn the same
+    against M, as exact fractions; None if the system is singular or the mix has
+    a non-positive weight.
+    """
+    k = len(support_cols)
+    # Unknowns: the k weights and the common value v. Equations: M[i, J] . y - v = 0, sum(y) = 1
+    rows = [[M[i][j] for j in support_cols] + [Fraction(-1), Fraction(0)] for i in support_rows]
+    rows.append([Fraction(1)] * k + [Fraction(0), Fraction(1)])
+    size = k + 1
+    if len(rows) != size:
+        return None
+
+    for col in range(size):
+        pivot = next((r for r in range(col, size) if rows[r][col] != 0), None)
+        if pivot is None:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        inv = 1 / rows[col][col]
+        rows[col] = [v * inv for v in rows[col]]
+        for r in range(size):
+            if r != col and rows[r][col] != 0:
+                factor = rows[r][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+
+    weights = [rows[i][size] for i in range(k)]
+    if any(w <= 0 for w in weights):
+        return None
+    return weights
+
+
+def _expand(weights, support, length):
+    full = [Fraction(0)] * length
+    for w, i in zip(weights, support):
+        full[i] = w
+    return full
+
+
+def is_equilibrium(A, B, x, y):
+    """Exact check that no pure deviation improves either player's expected payoff."""
+    m, n = len(A), len(A[0])
+    row_payoffs = [sum(A[i][j] * y[j] for j in range(n)) for i in range(m)]
+    col_payoffs = [sum(B[i][j] * x[i] for i in range(m)) for j in range(n)]
+    value_a = sum(x[i] * row_payoffs[i] for i in range(m))
+    value_b = sum(y[j] * col_payoffs[j] for j in range(n))
+    return max(row_payoffs) <= value_a and max(col_payoffs) <= value_b
+
+
+def _strictly_dominated(M, own, other, by_rows):
+    """Strategies in `own` strictly dominated by another pure strategy, given the opponent restricted to `other`."""
+    value = (lambda s, t: M[s][t]) if by_rows else (lambda s, t: M[t][s])
+    return {s for s in own
+            if any(all(value(d, t) > value(s, t) for t in other) for d in own if d != s)}
+
+
+def support_enumeration(A, B, stats=None):
+    """
+    All equilibria with equal-size supports (every equilibrium of a nondegenerate game).
+
+    Strictly dominated strategies are removed iteratively first, and a support
+    pair is skipped as soon as one side has a strategy dominated given the other
+    side's support, before any linear system is solved.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('supports_tried', 0)
+    A, B = _as_fractions(A), _as_fractions(B)
+    m, n = len(A), len(A[0])
+
+    rows, cols = set(range(m)), set(range(n))
+    while True:
+        drop_rows = _strictly_dominated(A, rows, cols, True)
+        drop_cols = _strictly_dominated(B, cols, rows, False)
+        if not drop_rows and not drop_cols:
+            break
+        rows -= drop_rows
+        cols -= drop_cols
+    rows, cols = sorted(rows), sorted(cols)
+
+    BT = [[B[i][j] for i in range(m)] for j in range(n)]
+    equilibria = []
+    for k in range(1, min(len(rows), len(cols)) + 1):
+        for I in itertools.combinations(rows, k):
+            for J in itertools.combinations(cols, k):
+                if _strictly_dominated(A, I, J, True) or _strictly_dominated(B, J, I, False):
+                    continue
+                stats['supports_tried'] += 1
+                y = _solve_indifference(A, I, J)
+                if y is None:
+                    continue
+                x = _solve_indifference(BT, J, I)
+                if x is None:
+                    continue
+                x, y = _expand(x, I, m), _expand(y, J, n)
+                if is_equilibrium(A, B, x, y):
+                    equilibria.append((x, y))
+    return equilibria
+
+
+def lemke_howson(A, B, dropped_label=0, stats=None):
+    """
+    One equilibrium by complementary pivoting on the two best-response polytopes.
+
+    Payoffs are shifted to be positive. Labels 0..m-1 are A's strategies and
+    m..m+n-1 are B's; the tableau P holds x (constraints B^T x <= 1) and Q holds y
+    (A y <= 1). The label that leaves one tableau enters the other until the
+    dropped label leaves. Pivots use exact fractions and the lexicographic ratio
+    test, so degenerate (integer) games cannot cycle.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('pivots', 0)
+    A, B = _as_fractions(A), _as_fractions(B)
+    m, n = len(A), len(A[0])
+    labels = m + n
+    shift_a = 1 - min(min(row) for row in A)
+    shift_b = 1 - min(min(row) for row in B)
+
+    # Columns: one per label, then the right-hand side
+    P = []
+    for j in range(n):
+        row = [B[i][j] + shift_b for i in range(m)] + [Fraction(int(k == j)) for k in range(n)] + [Fraction(1)]
+        P.append(row)
+    Q = []
+    for i in range(m):
+        row = [Fraction(int(k == i)) for k in range(m)] + [A[i][j] + shift_a for j in range(n)] + [Fraction(1)]
+        Q.append(row)
+    tableaux = {'P': (P, list(range(m, labels)), list(range(m, labels))),
+                'Q': (Q, list(range(m)), list(range(m)))}
+
+    def pivot(name, entering):
+        T, basis, slack_cols = tableaux[name]
+        best_row, best_key = None, None
+        for r, row in enumerate(T):
+            coeff = row[entering]
+            if coeff <= 0:
+                continue
+            key = [row[-1] / coeff] + [row[c] / coeff for c in slack_cols]
+            if best_key is None or key < best_key:
+                best_row, best_key = r, key
+        if best_row is None:
+            raise ValueError("Unbounded pivot in Lemke-Howson")
+
+        pivot_row = T[best_row]
+        inv = 1 / pivot_row[entering]
+        T[best_row] = pivot_row = [v * inv for v in pivot_row]
+        for r, row in enumerate(T):
+            if r != best_row and row[entering] != 0:
+                factor = row[entering]
+                T[r] = [a - factor * b for a, b in zip(row, pivot_row)]
+        leaving = basis[best_row]
+        basis[best_row] = entering
+        stats['pivots'] += 1
+        return leaving
+
+    name = 'P' if dropped_label < m else 'Q'
+    entering = dropped_label
+    while True:
+        leaving = pivot(name, entering)
+        if leaving == dropped_label:
+            break
+        name = 'Q' if name == 'P' else 'P'
+        entering = leaving
+
+    def strategy(name, offset, length):
+        T, basis, _ = tableaux[name]
+        values = [Fraction(0)] * length
+        for r, label in enumerate(basis):
+            if offset <= label < offset + length:
+                values[label - offset] = T[r][-1]
+        total = sum(values)
+        return [v / total for v in values]
+
+    return strategy('P', 0, m), strategy('Q', m, n)
+
+
+class MixedNashSolver:
+    """
+    Mixed equilibria with a bounded LRU cache.
+
+    Adding a constant to all of one player's payoffs does not change the
+    equilibria, so the cache key is a hash of the payoffs with each player's
+    minimum subtracted. Games with at most `enumeration_limit` strategies per
+    player get support enumeration (all equilibria of a nondegenerate game),
+    larger ones a single Lemke-Howson equilibrium.
+
+    With a `store` (a SolverCache), a miss in the in-process cache is looked up
+    in the store shared with the other generator processes before solving.
+    """
+
+    STORE_NAME = 'mixed-nash/1'
+
+    def __init__(self, max_entries=4096, enumeration_limit=4, store=None):
+        self.max_entries = max_entries
+        self.enumeration_limit = enumeration_limit
+        self.store = store
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def canonical_key(payoffs):
+        payoffs = np.asarray(payoffs, dtype=np.int64)
+        canonical = payoffs - payoffs.min(axis=(0, 1), keepdims=True)
+        return hashlib.sha1(np.ascontiguousarray(canonical).tobytes() + bytes(str(payoffs.shape), 'ascii')).hexdigest()
+
+    def solve(self, payoffs):
+        """Returns {'equilibria', 'method', 'supports_tried', 'pivots', 'elapsed', 'cached'}."""
+        key = self.canonical_key(payoffs)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return dict(result, cached=True)
+
+        self.misses += 1
+        if self.store is not None:
+            result = self.store.get_or_compute(self.STORE_NAME, key, lambda: self._solve(payoffs))
+        else:
+            result = self._solve(payoffs)
+
+        self.cache[key] = result
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return dict(result, cached=False)
+
+    def _solve(self, payoffs):
+        start = time.perf_counter()
+        payoffs = np.asarray(payoffs)
+        A, B = payoffs[..., 0].tolist(), payoffs[..., 1].tolist()
+        stats = {'supports_tried': 0, 'pivots': 0}
+        equilibria = []
+        if max(len(A), len(A[0])) <= self.enumeration_limit:
+            equilibria = support_enumeration(A, B, stats)
+            method = 'support enumeration'
+        if not equilibria:
+            # Large games, and degenerate ones whose equilibria have supports of different sizes
+            equilibria = [lemke_howson(A, B, 0, stats)]
+            method = 'Lemke-Howson'
+
+        return dict(stats, equilibria=equilibria, method=method, elapsed=time.perf_counter() - start)
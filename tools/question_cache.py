@@ -0,0 +1,37 @@
+import json
+
+from tools.sqlite_store import SQLiteLRUStore
+
+
+class QuestionCache(SQLiteLRUStore):
+    """
+    On-disk LRU cache of generated questions keyed by (category, seed).
+
+    Backed by SQLite so several generator processes can share one file (see
+    SQLiteLRUStore for the connections and the eviction).
+    """
+
+    TABLE = 'questions'
+    KEY_COLUMNS = ('category', 'seed')
+    PAYLOAD_TYPE = 'TEXT'
+
+    def __init__(self, path, max_entries=10000, evict_interval=64, flush_interval=64):
+        super().__init__(path, max_entries, evict_interval, flush_interval)
+
+    def get(self, category, seed, with_fingerprint=False):
+        """Returns the cached question tuple (with its instance fingerprint, if asked) or None."""
+        with self._lock:
+            payload = self._read((category, str(seed)))
+        if payload is None:
+            return None
+        # Rows written before fingerprints were stored have four fields
+        question_text, correct_ans, wrong_answers, explanation, *rest = json.loads(payload)
+        question = question_text, correct_ans, wrong_answers, explanation
+        if with_fingerprint:
+            return question, rest[0] if rest else None
+        return question
+
+    def put(self, category, seed, question, fingerprint=None):
+        payload = json.dumps(list(question) + [fingerprint], ensure_ascii=False)
+        with self._lock:
+            self._write((category, str(seed)), payload)
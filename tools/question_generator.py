@@ -1,579 +1,367 @@
 import json
 import random
 import os
-import heapq
-
-class QuestionGenerator:
-
-    def __init__(self, resources_path):
-        templates_path = os.path.join(resources_path, 'question_templates.json')
-        with open(templates_path, 'r', encoding='utf-8') as file:
-            self.templates = json.load(file)
-
-        self.problems_list = [
-            "n-queens",
-            "generalised Hanoi",
-            "graph coloring",
-            "knight's tour"
-        ]
-
-        self.all_algorithms_pool = [
-            "Random Search",
-            "Breadth-First Search (BFS)",
-            "Uniform Cost Search",
-            "Depth-First Search (DFS)",
-            "Iterative Deepening Search (IDS)",
-            "Bidirectional Search",
-            "Standard Backtracking",
-            "Greedy Best-First Search",
-            "Hillclimbing",
-            "Simulated Annealing",
-            "Beam Search",
-            "A* Search",
-            "IDA* (Iterative Deepening A*)",
-            "Min-Conflicts Heuristic",
-            "Backtracking with Forward Checking"
-        ]
-
-    def generate_random_question(self, specific_category=None):
-            if specific_category:
-                category = specific_category
-            else:
-                category = random.choice(
-                    ['strategy_simulation', 'nash_equilibrium', 'csp_evaluation', 'minmax_evaluation'])
-
-            if category == 'strategy_simulation':
-                return self._gen_strategy()
-            elif category == 'nash_equilibrium':
-                return self._gen_nash()
-            elif category == 'csp_evaluation':
-                return self._gen_csp()
-            elif category == 'minmax_evaluation':
-                return self._gen_minmax()
-            else:
-                return self._gen_strategy()
+import itertools
+import multiprocessing.util
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 
+from tools.question_cache import QuestionCache
+from tools.solver_cache import SolverCache
+from tools.budget import Budget, BudgetExhausted
+from tools.instance_scheduler import InstanceScheduler
+from tools.fingerprint import instance_fingerprint, SeenInstances
+from tools.category_registry import category_names, load_category
 
-    def _gen_minmax(self):
-        template_obj = random.choice(self.templates['minmax_evaluation'])
-        raw_text = template_obj['template']
 
-        config = random.choice([
-            {'depth': 2, 'branching': 3},
-            {'depth': 2, 'branching': 2},
-            {'depth': 3, 'branching': 2},
-        ])
+# Part of the question cache key: bump it whenever seeded questions or their fingerprints
+# change, so questions cached by older code are not served
+QUESTION_VERSION = 3
 
-        depth = config['depth']
-        branching = config['branching']
 
-        def build_tree(current_depth):
-            if current_depth == depth:
-                return random.randint(1, 20)
-            else:
-                return [build_tree(current_depth + 1) for _ in range(branching)]
+# --- BATCH WORKERS (one QuestionGenerator per pool process) ---
+_batch_generator = None
 
-        game_tree = build_tree(0)
 
-        total_leaves_count = branching ** depth
+def _batch_worker_init(resources_path, cache_path=None, cache_size=10000, solver_cache_path=None, target_latency=0.2,
+                       cost_model_path=None, categories=None):
+    global _batch_generator
+    _batch_generator = QuestionGenerator(resources_path, cache_path, cache_size, solver_cache_path, target_latency,
+                                         cost_model_path, categories)
+    _batch_generator.load_categories()
+    # Pool processes have no exit hook of their own: the cost model and the caches are saved when the process ends
+    multiprocessing.util.Finalize(None, _batch_generator.close, exitpriority=10)
 
-        instance_details = (
-            f"Tree Structure (Nested List): {str(game_tree)}\n"
-            f"Depth: {depth}\n"
-            f"Branching Factor: {branching}"
-        )
 
-        visited_leaves = 0
+def _batch_worker_generate(category, seed=None, time_budget=None):
+    # BudgetExhausted travels back to the caller through the future
+    budget = Budget(max_seconds=time_budget) if time_budget is not None else None
+    return _batch_generator.generate_random_question(specific_category=category, seed=seed,
+                                                     with_fingerprint=True, budget=budget)
+# ---------------------------------------------------------------
 
-        def solve_alpha_beta(node, current_depth, is_max, alpha, beta):
-            nonlocal visited_leaves
 
-            if isinstance(node, int):
-                visited_leaves += 1
-                return node
-
-            if is_max:
-                best_val = -float('inf')
-                for child in node:
-                    val = solve_alpha_beta(child, current_depth + 1, False, alpha, beta)
-                    best_val = max(best_val, val)
-                    alpha = max(alpha, best_val)
-
-                    if beta <= alpha:
-                        break
-                return best_val
+class QuestionGenerator:
+    """
+    Shared services for the question categories: templates, the question and solver
+    caches, the size scheduler and the budget of the question being generated.
+
+    The categories themselves live in tools/categories and are found through
+    tools.category_registry; each one is imported and built the first time a
+    question of it is asked for, so a process only loads what it generates.
+    `categories` limits the ones drawn from when no category is given (default:
+    every registered category).
+    """
+
+    def __init__(self, resources_path, cache_path=None, cache_size=10000, solver_cache_path=None,
+                 target_latency=0.2, cost_model_path=None, categories=None):
+        self.resources_path = resources_path
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.cache = QuestionCache(cache_path, cache_size) if cache_path else None
+        # Solver results shared by every process using the same file
+        self.solver_cache_path = solver_cache_path
+        self.solver_cache = SolverCache(solver_cache_path) if solver_cache_path else None
+        # Unseeded questions get the largest sizes whose measured p99 time fits target_latency (None: fixed sizes)
+        self.target_latency = target_latency
+        self.cost_model_path = cost_model_path
+        self.scheduler = None
+        if target_latency is not None:
+            if cost_model_path:
+                self.scheduler = InstanceScheduler.open(cost_model_path, target_latency)
             else:
-                best_val = float('inf')
-                for child in node:
-                    val = solve_alpha_beta(child, current_depth + 1, True, alpha, beta)
-                    best_val = min(best_val, val)
-                    beta = min(beta, best_val)
-
-                    if beta <= alpha:
-                        break
-                return best_val
-
-        root_val = solve_alpha_beta(game_tree, 0, True, -float('inf'), float('inf'))
-
-        correct_ans = f"Root: {root_val}, Visited leaves: {visited_leaves}"
-
-        explanation = (
-            f"The MinMax algorithm evaluates the tree by propagating values from the leaves. "
-            f"Alpha-Beta pruning optimizes this by cutting off branches that won't affect the decision. "
-            f"Here, the root value is determined to be {root_val}. Due to pruning, the algorithm only needed "
-            f"to visit {visited_leaves} leaves out of a total possible {total_leaves_count}, proving its efficiency."
-        )
-
-        wrong_answers = set()
-        attempts = 0
-
-        while len(wrong_answers) < 3 and attempts < 50:
-            r_val = random.randint(1, 25)
-
-            r_vis = random.randint(1, total_leaves_count)
-
-            candidate = f"Root: {r_val}, Visited leaves: {r_vis}"
-            if candidate != correct_ans:
-                wrong_answers.add(candidate)
-
-            attempts += 1
-
-        wrong_list = list(wrong_answers)
-
-        return raw_text.format(instance_details=instance_details), correct_ans, list(wrong_list)[:3], explanation
-
-    def generate_problem_instance(self, problem):
-        # Now returns 3 values: instance_str, winner, explanation
-        if problem == 'n-queens':
-            return self._race_n_queens()
-        elif problem == 'generalised Hanoi':
-            return self._race_hanoi_logic()
-        elif problem == 'graph coloring':
-            return self._race_graph_coloring()
-        elif problem == "knight's tour":
-            return self._race_knights_tour()
-
-    def _race_n_queens(self):
-        n = 8
-        board = [random.randint(0, n - 1) for _ in range(n)]  # board[col] = row
-
-        def count_conflicts(current_board):
-            conflicts = 0
-            for i in range(n):
-                for j in range(i + 1, n):
-                    if current_board[i] == current_board[j] or abs(current_board[i] - current_board[j]) == abs(i - j):
-                        conflicts += 1
-            return conflicts
-
-        initial_conflicts = count_conflicts(board)
-        instance_str = f"An {n}x{n} board with initial configuration (rows): {board}. Current conflicts: {initial_conflicts}."
-
-        # ALGORITM 1: Min-Conflicts
-        mc_board = list(board)
-        mc_improved = False
-        col_to_fix = random.randint(0, n - 1)
-        min_conf = count_conflicts(mc_board)
-
-        for r in range(n):
-            mc_board[col_to_fix] = r
-            c = count_conflicts(mc_board)
-            if c < min_conf:
-                min_conf = c
-                mc_improved = True
-
-        # ALGORITM 2: Random Walk (Uninformed)
-        rw_board = list(board)
-        rw_board[col_to_fix] = random.randint(0, n - 1)
-        rw_conf = count_conflicts(rw_board)
-        rw_improved = rw_conf < initial_conflicts
-
-        if mc_improved:
-            winner = "Min-Conflicts Heuristic"
-            explanation = (
-                f"The Min-Conflicts heuristic specifically targets the variable with conflicts and chooses the value "
-                f"that minimizes them. In this step, it successfully reduced conflicts from {initial_conflicts} to {min_conf}. "
-                f"Random search (uninformed) often fails to improve or does so inefficiently."
-            )
-        elif rw_improved:
-            winner = "Random Search"
-            explanation = (
-                f"In this rare random instance, a random move happened to improve the state to {rw_conf} conflicts. "
-                f"Min-Conflicts found no immediate local improvement (plateau), making the random jump the 'winner' for this specific step."
-            )
-        else:
-            winner = "Standard Backtracking"
-            explanation = (
-                f"Neither the local heuristic (Min-Conflicts) nor the random step found an immediate improvement. "
-                f"Standard Backtracking is required to systematically explore the tree and escape this local optimum."
-            )
-
-        return instance_str, winner, explanation
-
-    def _race_graph_coloring(self):
-        nodes = ['A', 'B', 'C', 'D', 'E']
-        edges = {}
-        for n in nodes:
-            edges[n] = []
-
-        edge_desc = []
-        for i in range(len(nodes)):
-            for j in range(i + 1, len(nodes)):
-                if random.random() > 0.4:
-                    u, v = nodes[i], nodes[j]
-                    edges[u].append(v)
-                    edges[v].append(u)
-                    edge_desc.append(f"{u}-{v}")
-
-        instance_str = f"Graph nodes: {nodes}. Edges: {', '.join(edge_desc)}."
-
-        # ALGORITM 1: Degree Heuristic (Smart)
-        degrees = {n: len(edges[n]) for n in nodes}
-        sorted_nodes = sorted(degrees.items(), key=lambda item: item[1], reverse=True)
-        smart_degree = sorted_nodes[0][1]
-        smart_node = sorted_nodes[0][0]
-
-        # ALGORITM 2: Random Choice (Naive)
-        naive_choice = random.choice(nodes)
-        naive_degree = degrees[naive_choice]
-
-        if smart_degree > naive_degree:
-            winner = "Backtracking with Forward Checking"
-            explanation = (
-                f"Efficient graph coloring uses the 'Degree Heuristic' (choosing the most constrained variable first). "
-                f"Node {smart_node} has the highest degree ({smart_degree}), imposing the most constraints. "
-                f"The random choice {naive_choice} only has degree {naive_degree}. Choosing the most constrained variable first prunes the search tree effectively."
-            )
-        else:
-            winner = "Standard Backtracking"
-            explanation = (
-                f"In this instance, the random choice picked a node with the same degree as the maximum degree ({smart_degree}). "
-                f"Since there is no heuristic advantage in this specific comparison, Standard Backtracking is the baseline correct answer."
-            )
-
-        return instance_str, winner, explanation
-
-    def _race_knights_tour(self):
-
-        cols = "ABCDEFGH"
-        start_c, start_r = random.randint(0, 7), random.randint(0, 7)
-        start_pos_str = f"{cols[start_c]}{start_r + 1}"
-
-        instance_str = f"8x8 Chessboard. Knight at {start_pos_str}. Goal: Visit all squares."
-
-        moves = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
-
-        def get_valid_moves(c, r):
-            valid = []
-            for dc, dr in moves:
-                nc, nr = c + dc, r + dr
-                if 0 <= nc < 8 and 0 <= nr < 8:
-                    valid.append((nc, nr))
-            return valid
-
-        # ALGORITM 1: Warnsdorff (Greedy Best-First)
-        current_moves = get_valid_moves(start_c, start_r)
-
-        if not current_moves:
-            return instance_str, "Random Search", "No moves available. Any strategy fails."
-
-        min_degree = 9
-        best_move = None
-        for (nc, nr) in current_moves:
-            degree = len(get_valid_moves(nc, nr))
-            if degree < min_degree:
-                min_degree = degree
-                best_move = (nc, nr)
-
-        rand_move = random.choice(current_moves)
-        rand_degree = len(get_valid_moves(rand_move[0], rand_move[1]))
-
-        if min_degree <= rand_degree:
-            winner = "Greedy Best-First Search"
-            explanation = (
-                f"Warnsdorff's Rule is a Greedy Best-First strategy that selects the move leading to the square with the fewest onward moves. "
-                f"The best move leads to a square with {min_degree} moves, while the random move leads to one with {rand_degree} moves. "
-                f"Minimizing the degree prevents the knight from getting stranded early."
-            )
-        else:
-            winner = "Random Search"
-            explanation = "Random Search logic fallback (unexpected case)."
-
-        return instance_str, winner, explanation
-
-    def _race_hanoi_logic(self):
-
-        n_disks = random.randint(3, 4)
-        optimal_steps_math = 2 ** n_disks - 1
-        instance_str = f"Hanoi Towers with {n_disks} disks. Goal: Move stack to the last tower."
-
-        initial_state = (tuple(range(n_disks)), (), ())
-        goal_state = ((), (), tuple(range(n_disks)))
-
-        # --- IMPLEMENTARE A* SEARCH ---
-
-        def heuristic(state):
-            return n_disks - len(state[2])
-
-        open_set = []
-        heapq.heappush(open_set, (heuristic(initial_state), 0, initial_state))
-
-        g_score = {initial_state: 0}
-
-        solution_found_steps = -1
-
-        while open_set:
-            current_f, current_g, current_state = heapq.heappop(open_set)
-
-            if current_state == goal_state:
-                solution_found_steps = current_g
-                break
-
-            towers = [list(t) for t in current_state]
-
-            for source_idx in range(3):
-                if not towers[source_idx]:
-                    continue
-
-                disk = towers[source_idx][0]
-
-                for target_idx in range(3):
-                    if source_idx == target_idx:
-                        continue
-
-                    if not towers[target_idx] or towers[target_idx][0] > disk:
-                        new_towers = [list(t) for t in current_state]
-                        new_towers[source_idx].pop(0)
-                        new_towers[target_idx].insert(0, disk)
-                        neighbor = tuple(tuple(t) for t in new_towers)
-
-                        tentative_g = current_g + 1
-
-                        if tentative_g < g_score.get(neighbor, float('inf')):
-                            g_score[neighbor] = tentative_g
-                            f = tentative_g + heuristic(neighbor)
-                            heapq.heappush(open_set, (f, tentative_g, neighbor))
-
-
-        if solution_found_steps == optimal_steps_math:
-            winner = "A* Search"
-            explanation = (
-                f"A* Search combines path cost (g) and heuristic (h) to guarantee optimality. "
-                f"For {n_disks} disks, the optimal solution takes {optimal_steps_math} steps. "
-                f"A* found the solution in exactly {solution_found_steps} steps. Greedy approaches often yield suboptimal paths."
-            )
-        else:
-            winner = "Greedy Best-First Search"
-            explanation = "A suboptimal path was found, which is typical for Greedy Search."
-
-        return instance_str, winner, explanation
-
-    def _solve_forward_checking(self, template_text):
-        colors = ['Red', 'Green', 'Blue', 'Yellow', 'Orange', 'Purple', 'Brown']
-
-        number_of_nodes = random.randint(1, 10)
-        number_of_colors = random.randint(1, len(colors))
-
-        nodes_used_set = set()
-        for i in range(number_of_nodes):
-            nodes_used_set.add(chr(ord('A') + i))
-
-        nodes_used = sorted(list(nodes_used_set))
-
-        colors_used = set()
-        while len(colors_used) < number_of_colors:
-            colors_used.add(random.choice(colors))
-        colors_list = sorted(list(colors_used))
-
-        edges = []
-        adjacency = {n: [] for n in nodes_used}
-
-        for i in range(len(nodes_used)):
-            for j in range(i + 1, len(nodes_used)):
-                if random.random() > 0.5:
-                    u, v = nodes_used[i], nodes_used[j]
-                    edges.append(f"{u}-{v}")
-                    adjacency[u].append(v)
-                    adjacency[v].append(u)
-
-        edges_str = ", ".join(edges) if edges else "No constraints (Independent variables)"
-
-        nodes_with_neighbors = [n for n in nodes_used if len(adjacency[n]) > 0]
-        assigned_node = random.choice(nodes_with_neighbors) if nodes_with_neighbors else random.choice(nodes_used)
-        assigned_color = random.choice(colors_list)
+                self.scheduler = InstanceScheduler(target_latency)
+        self._scheduled = None
+        self._instance_key = None
+        # Budget of the question being generated, charged by every solver run for it
+        self.budget = None
+        templates_path = os.path.join(resources_path, 'question_templates.json')
+        with open(templates_path, 'r', encoding='utf-8') as file:
+            self.templates = json.load(file)
 
-        instance_details = (
-            f"Variables: {', '.join(nodes_used)}\n"
-            f"Initial Domains: {{{', '.join(colors_list)}}}\n"
-            f"Constraints (Edges): {edges_str}\n"
-            f"Recent Move: Backtracking assigned {assigned_node} = {assigned_color}"
-        )
+        self.categories = list(categories) if categories else category_names()
+        self._category_objects = {}
 
-        full_domain_str = ", ".join(colors_list)
-        reduced_domain_list = [c for c in colors_list if c != assigned_color]
-        reduced_domain_str = ", ".join(reduced_domain_list)
+    def generate_random_question(self, specific_category=None, seed=None, with_fingerprint=False, budget=None):
+            """
+            Every question draws from its own random.Random, never from the global one.
+            With a `seed`, the pair (category, seed) fully determines the question and
+            is looked up in / stored to the on-disk cache (if one is configured).
+            With `with_fingerprint`, returns (question, fingerprint), where the
+            fingerprint identifies the underlying instance (see tools/fingerprint.py).
 
-        ans_parts = []
-        neighbors_affected = []
-        remaining_nodes = [n for n in nodes_used if n != assigned_node]
+            With a `budget` (tools.budget.Budget), every solver run for the question
+            is charged to it; if it runs out, the solvers stop and BudgetExhausted is
+            raised, so the call returns within the budget without being killed.
 
-        for n in remaining_nodes:
-            if n in adjacency[assigned_node]:
-                ans_parts.append(f"{n}: {{{reduced_domain_str}}}")
-                neighbors_affected.append(n)
+            Without a seed, instance sizes come from the scheduler (see each category's SCHEDULED_SIZES);
+            seeded questions always draw from the fixed size lists, so they stay reproducible.
+            """
+            if specific_category:
+                category = specific_category
+            elif seed is not None:
+                category = random.Random(seed).choice(self.categories)
             else:
-                ans_parts.append(f"{n}: {{{full_domain_str}}}")
-
-        correct_ans = ", ".join(ans_parts)
-
-        explanation = (
-            f"Forward Checking maintains consistency by removing the assigned value from the domains of all connected neighbors. "
-            f"Here, {assigned_node} was assigned {assigned_color}. Its neighbors are {neighbors_affected}. "
-            f"Thus, {assigned_color} must be removed from their domains to satisfy the constraint."
-        )
-
-        wrong_answers = set()
-        attempts = 0
-
-        while len(wrong_answers) < 3 and attempts < 50:
-            current_wrong = []
-            for n in remaining_nodes:
-                dom = random.choice([full_domain_str, reduced_domain_str])
-                current_wrong.append(f"{n}: {{{dom}}}")
-            w_str = ", ".join(current_wrong)
-            if w_str != correct_ans: wrong_answers.add(w_str)
-            attempts += 1
-        while len(wrong_answers) < 3: wrong_answers.add("No changes made")
-
-        return template_text.format(instance_details=instance_details), correct_ans, list(wrong_answers)[:3], explanation
-
-    def _gen_csp(self):
-        template_obj = random.choice(self.templates['csp_evaluation'])
-        raw_text = template_obj['template']
-
-        if 'Forward Checking' in raw_text:
-            return self._solve_forward_checking(raw_text)
-        else:
-            return self._solve_mrv(raw_text)
-
-    def _solve_mrv(self, template_text):
-        colors = ['Red', 'Green', 'Blue', 'Yellow', 'Orange', 'Purple', 'Brown']
-
-        number_of_nodes = random.randint(1, 10)
-        number_of_colors = random.randint(1, len(colors))
-
-        nodes_used = sorted(list({chr(ord('A') + i) for i in range(number_of_nodes)}))
-        colors_list = random.sample(colors, min(len(colors), number_of_colors))
-        colors_list.sort()
-
-        domain_state = {}
-        for node in nodes_used:
-            size = random.randint(1, len(colors_list))
-            domain_state[node] = sorted(random.sample(colors_list, size))
-
-        display_lines = [f"   Variable {node}: {{{', '.join(cols)}}}" for node, cols in domain_state.items()]
-        random.shuffle(display_lines)
-        instance_details = "Current Domains:\n" + "\n".join(display_lines)
-
-        min_len = min(len(cols) for cols in domain_state.values())
-        winners = [n for n, cols in domain_state.items() if len(cols) == min_len]
-        winners.sort()
-
-        best_var = winners[0]
-        correct_ans = f"Variable {best_var} (size {min_len})"
-
-        explanation = (
-            f"The MRV (Minimum Remaining Values) heuristic optimizes CSP solving by selecting the variable "
-            f"with the fewest legal values left in its domain. This helps identify failures early. "
-            f"Variable {best_var} has the smallest domain size ({min_len}), making it the correct choice."
-        )
-
-        wrong_answers = set()
-        attempts = 0
-
-        while len(wrong_answers) < 3 and attempts < 50:
-            node = random.choice(nodes_used)
-            size = len(domain_state[node])
-            fake = f"Variable {node} (size {size})"
-            if size > min_len: wrong_answers.add(fake)
-            elif size == min_len and node != best_var: wrong_answers.add(f"Variable {node} (random tie)")
-            attempts += 1
-        while len(wrong_answers) < 3: wrong_answers.add("Any variable")
-
-        return template_text.format(instance_details=instance_details), correct_ans, list(wrong_answers)[:3], explanation
-
-    def _generate_wrong_answers(self, problem_answer):
-
-        pool = [algo for algo in self.all_algorithms_pool if algo != problem_answer]
-        return random.sample(pool, min(3, len(pool)))
-
-    def _gen_strategy(self):
-        template_obj = random.choice(self.templates['strategy_simulation'])
-        raw_text = template_obj['template']
-
-        problem = random.choice(self.problems_list)
-        
-        problem_instance, problem_answer, explanation = self.generate_problem_instance(problem)
-
-        question_text = raw_text.format(problem_name=problem, instance_details=problem_instance)
-        wrong_answers = self._generate_wrong_answers(problem_answer)
-
-        return question_text, problem_answer, wrong_answers, explanation
-
-    def _gen_nash(self):
-        template_obj = random.choice(self.templates['nash_equilibrium'])
-        raw_text = template_obj['template']
-
-        matrix = [[(random.randint(-5, 10), random.randint(-5, 10)) for _ in range(2)] for _ in range(2)]
-
-        matrix_str = (
-            f"        Player B (Left)   Player B (Right)\n"
-            f"A (Up)     {matrix[0][0]}             {matrix[0][1]}\n"
-            f"A (Down)   {matrix[1][0]}             {matrix[1][1]}"
-        )
-
-        equilibria = []
-        analysis_lines = []
-        for r in range(2):
-            for c in range(2):
-                val_a, val_b = matrix[r][c]
-                alt_a = matrix[1 - r][c][0]
-                best_a = alt_a <= val_a
-                
-                alt_b = matrix[r][1 - c][1]
-                best_b = alt_b <= val_b
-
-                if best_a and best_b:
-                    row_name = "Up" if r == 0 else "Down"
-                    col_name = "Left" if c == 0 else "Right"
-                    equilibria.append(f"(A:{row_name}, B:{col_name})")
-                    analysis_lines.append(f"- (A:{row_name}, B:{col_name}) is stable: A ({val_a} >= {alt_a}) and B ({val_b} >= {alt_b}) cannot improve.")
-
-        if not equilibria:
-            ans = "No pure Nash equilibrium exists."
-            explanation = "Checking all 4 outcomes reveals that in every case, at least one player can improve their payoff by unilaterally switching strategy."
-        else:
-            ans = "Pure Nash Equilibria: " + ", ".join(equilibria)
-            explanation = "A Nash Equilibrium is a state where no player benefits from changing strategy alone.\n" + "\n".join(analysis_lines)
-
-        # Generate 3 unique false answers
-        possible_fakes = [
-            "No pure Nash equilibrium exists.",
-            "Pure Nash Equilibria: (A:Up, B:Left)",
-            "Pure Nash Equilibria: (A:Up, B:Right)",
-            "Pure Nash Equilibria: (A:Down, B:Left)",
-            "Pure Nash Equilibria: (A:Down, B:Right)",
-            "Pure Nash Equilibria: (A:Up, B:Left), (A:Down, B:Right)",
-            "Pure Nash Equilibria: (A:Up, B:Right), (A:Down, B:Left)"
-        ]
-
-        wrong_answers = []
-        attempts = 0
-        while len(wrong_answers) < 3 and attempts < 100:
-            fake = random.choice(possible_fakes)
-            # Ensure the fake answer is not the correct one and hasn't been added yet
-            if fake != ans and fake not in wrong_answers:
-                wrong_answers.append(fake)
-            attempts += 1
-        while len(wrong_answers) < 3: wrong_answers.append("No pure Nash equilibrium exists.")
-
-        return raw_text.format(matrix_representation=matrix_str), ans, wrong_answers, explanation
\ No newline at end of file
+                category = random.choice(self.categories)
+
+            cached = None
+            if seed is not None and self.cache is not None:
+                cached = self.cache.get(f"{category}/{QUESTION_VERSION}", seed, with_fingerprint=True)
+
+            if cached is not None:
+                res, key = cached
+                if key is None:
+                    key = instance_fingerprint(category, res[0])
+            elif seed is None:
+                res, key = self._generate_category(category, random.Random(), budget, scheduled=True)
+            else:
+                # String seeding is hashed with sha512, so it is stable across processes
+                res, key = self._generate_category(category, random.Random(f"{category}:{seed}"), budget)
+                if self.cache is not None:
+                    self.cache.put(f"{category}/{QUESTION_VERSION}", seed, res, key)
+
+            return (res, key) if with_fingerprint else res
+
+    def category(self, name):
+        """The QuestionCategory for `name`, loaded on first use (ValueError if it is not registered)."""
+        category = self._category_objects.get(name)
+        if category is None:
+            category = self._category_objects[name] = load_category(name)(self)
+        return category
+
+    def load_categories(self):
+        """Loads every category in self.categories now, e.g. while a worker starts up."""
+        for name in self.categories:
+            self.category(name)
+
+    def solve_cached(self, solver, key_parts, compute):
+        """`compute()`, looked up first in the shared solver cache under (solver, canonical key of key_parts)."""
+        if self.solver_cache is None:
+            result = compute()
+            self.check_budget()
+            return result
+
+        key = instance_fingerprint(solver, *key_parts)
+        result = self.solver_cache.get(solver, key)
+        if result is None:
+            result = compute()
+            # Results cut short by the question's budget are not stored
+            self.check_budget()
+            self.solver_cache.put(solver, key, result)
+        return result
+
+    def check_budget(self):
+        """
+        Gives up on the question once its budget has run out. The clock is read here,
+        so time spent outside the solvers (sampling large instances, unbudgeted
+        solvers) counts as well.
+        """
+        if self.budget is not None and not self.budget.check():
+            raise BudgetExhausted(f"Question budget exhausted ({self.budget.reason}, {self.budget.nodes} nodes)")
+
+    def set_instance_key(self, key):
+        """Called by a category with the fingerprint of the instance its question is about."""
+        self._instance_key = key
+
+    def _generate_category(self, category, rng, budget=None, scheduled=False):
+            """Returns the question and the fingerprint of its instance (of its text if the category set none)."""
+            generator = self.category(category)
+            self._instance_key = None
+            self.budget = budget
+            self._scheduled = [] if scheduled and self.scheduler is not None else None
+            start = time.perf_counter()
+            try:
+                res = generator.generate(rng)
+                # Whatever ran after the last solver (rendering, distractors) counts too
+                self.check_budget()
+            finally:
+                # A question cut short by its budget still took that long: the model learns it too
+                elapsed = time.perf_counter() - start
+                for knob, option, size in self._scheduled or ():
+                    self.scheduler.record(knob, option, size, elapsed)
+                self.budget = None
+                self._scheduled = None
+            return res, self._instance_key or instance_fingerprint(category, res[0])
+
+    def pick_size(self, knob, default_options, scheduled_options, rng):
+        """
+        Instance size for `knob`: from the scheduler, among `scheduled_options`
+        ((option, size) pairs, cheapest first), for unseeded questions; otherwise
+        uniformly from `default_options`.
+        """
+        if self._scheduled is None:
+            return rng.choice(default_options)
+        option = self.scheduler.choose(knob, scheduled_options, rng)
+        self._scheduled.append((knob, option, dict(scheduled_options)[option]))
+        return option
+
+    def save_cost_model(self):
+        if self.scheduler is not None:
+            self.scheduler.save()
+
+    def close(self):
+        """Saves the cost model and writes out what the caches still hold in memory (their counters)."""
+        self.save_cost_model()
+        for cache in (self.cache, self.solver_cache):
+            if cache is not None:
+                cache.close()
+
+    def generate_nash_bank(self, n, rows=2, cols=2, seed=None, max_attempts=None, with_info=False, stats=None,
+                           seen=None, chunk_size=4096):
+        """
+        Yields `n` unique pure Nash questions on rows x cols games, solved `chunk_size`
+        games per vectorized call (see NashCategory.generate_bank). `max_attempts`,
+        `with_info`, `stats` and `seen` work as in generate_batch; the questions are
+        reproducible from `seed` as a whole, so their info carries no seed of their own.
+        """
+        if max_attempts is None:
+            max_attempts = 3 * n + 10
+        if stats is None:
+            stats = {}
+        stats.update(submitted=0, duplicates=0, errors=0, over_budget=0)
+        if seen is None:
+            seen = SeenInstances()
+
+        bank = self.category('nash_equilibrium').generate_bank(rows, cols, seed, min(chunk_size, max(1, n)))
+        produced = 0
+        while produced < n and stats['submitted'] < max_attempts:
+            q_data, key = next(bank)
+            stats['submitted'] += 1
+            if not seen.add_if_new(key):
+                stats['duplicates'] += 1
+                continue
+
+            produced += 1
+            if with_info:
+                yield q_data, {'category': 'nash_equilibrium', 'seed': None, 'fingerprint': key}
+            else:
+                yield q_data
+
+    def generate_batch(self, n, categories=None, workers=None, max_attempts=None,
+                       seed=None, ordered=False, with_info=False, stats=None, seen=None, time_budget=None):
+        """
+        Yields `n` unique questions, cycling through `categories`.
+
+        The work is spread over `workers` processes (default: all cores) and the
+        questions are yielded as soon as they finish, so the first one can be shown
+        before the batch is done. Questions on an instance already produced (same
+        fingerprint) are dropped and regenerated, up to `max_attempts` generations in
+        total; pass a SeenInstances as `seen` to also skip instances from earlier runs.
+        Every worker loads only the categories of the batch. workers=1 runs in-process.
+
+        With a `seed`, every task gets its own seed derived from it; together with
+        `ordered=True` (results yielded in submission order) the batch is reproducible.
+        `with_info=True` yields `(question, {'category', 'seed', 'fingerprint'})` pairs, and a dict passed
+        as `stats` is filled with submitted/duplicates/errors/over_budget counters.
+        Worker processes add what they measured to the generator's cost model file when they exit.
+
+        With `time_budget` (seconds), every question gets a Budget: a question whose
+        solvers run out of time is dropped (counted as over_budget) instead of
+        holding up the batch.
+        """
+        categories = list(categories) if categories else list(self.categories)
+        if max_attempts is None:
+            max_attempts = 3 * n + 10
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if stats is None:
+            stats = {}
+        stats.update(submitted=0, duplicates=0, errors=0, over_budget=0)
+
+        category_cycle = itertools.cycle(categories)
+        seed_rng = random.Random(seed) if seed is not None else None
+        if seen is None:
+            seen = SeenInstances()
+        produced = 0
+
+        def next_task():
+            stats['submitted'] += 1
+            task_seed = seed_rng.getrandbits(63) if seed_rng is not None else None
+            return next(category_cycle), task_seed
+
+        def accept(category, task_seed, result):
+            nonlocal produced
+            if isinstance(result, BudgetExhausted):
+                stats['over_budget'] += 1
+                return None
+            if result is None:
+                stats['errors'] += 1
+                return None
+            q_data, key = result
+            if produced >= n or not seen.add_if_new(key):
+                stats['duplicates'] += 1
+                return None
+
+            produced += 1
+            if with_info:
+                return q_data, {'category': category, 'seed': task_seed, 'fingerprint': key}
+            return q_data
+
+        if workers <= 1:
+            while produced < n and stats['submitted'] < max_attempts:
+                category, task_seed = next_task()
+                budget = Budget(max_seconds=time_budget) if time_budget is not None else None
+                try:
+                    q_data = self.generate_random_question(specific_category=category, seed=task_seed,
+                                                           with_fingerprint=True, budget=budget)
+                except BudgetExhausted as e:
+                    q_data = e
+                except Exception as e:
+                    print(f"Gen Error in batch: {e}")
+                    q_data = None
+                item = accept(category, task_seed, q_data)
+                if item is not None:
+                    yield item
+            return
+
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_batch_worker_init,
+                                       initargs=(self.resources_path, self.cache_path, self.cache_size,
+                                                 self.solver_cache_path, self.target_latency, self.cost_model_path,
+                                                 categories))
+        try:
+            in_flight = {}
+            finished = {}  # results waiting for their turn when `ordered`
+            next_to_yield = 0
+            # A couple of tasks per worker keeps every core busy without overshooting n by much
+            window = 2 * workers
+
+            while produced < n:
+                while (len(in_flight) + len(finished) < window and stats['submitted'] < max_attempts
+                       and produced + len(in_flight) + len(finished) < n + workers):
+                    task_idx = stats['submitted']
+                    category, task_seed = next_task()
+                    fut = executor.submit(_batch_worker_generate, category, task_seed, time_budget)
+                    in_flight[fut] = (task_idx, category, task_seed)
+
+                if not in_flight and not finished:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    task_idx, category, task_seed = in_flight.pop(fut)
+                    try:
+                        q_data = fut.result()
+                    except BudgetExhausted as e:
+                        q_data = e
+                    except Exception as e:
+                        print(f"Gen Error in batch: {e}")
+                        q_data = None
+                    finished[task_idx] = (category, task_seed, q_data)
+
+                if ordered:
+                    ready = []
+                    while next_to_yield in finished:
+                        ready.append(finished.pop(next_to_yield))
+                        next_to_yield += 1
+                else:
+                    ready = list(finished.values())
+                    finished.clear()
+
+                for category, task_seed, q_data in ready:
+                    item = accept(category, task_seed, q_data)
+                    if item is not None:
+                        yield item
+        finally:
+            # Waits only for the few tasks in flight, so the workers have saved their cost models
+            # and cache counters (see _batch_worker_init) by the time the batch ends
+            executor.shutdown(wait=True, cancel_futures=True)
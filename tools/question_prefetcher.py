@@ -0,0 +1,95 @@
+import random
+import threading
+from collections import deque
+
+
+class QuestionPrefetcher:
+    """
+    Keeps the next `capacity` questions generated in the background.
+
+    Questions are requested from a GeneratorPool for the active categories and
+    deduplicated by instance fingerprint as they arrive, against `seen` (a
+    SeenInstances shared with the quiz window) and against the questions already
+    buffered, so `pop()` is a constant-time deque pop. Nothing is added to `seen`
+    here: the window records a question when it shows it, so buffered questions
+    that are never shown stay available to later sessions.
+    """
+
+    def __init__(self, pool, categories, seen, capacity=3, max_total=None, max_failures=15):
+        self.pool = pool
+        self.categories = list(categories)
+        self.seen = seen
+        self.capacity = capacity
+        self.max_total = max_total
+        self.max_failures = max_failures
+
+        self._ready = deque()
+        self._keys = set()  # fingerprints of every question handed out or buffered
+        self._in_flight = set()
+        self._produced = 0
+        self._failures = 0
+        self._stopped = False
+        self._rng = random.Random()
+        self._cond = threading.Condition(threading.RLock())
+
+        self._refill()
+
+    @property
+    def exhausted(self):
+        """True when nothing is buffered and no more questions will arrive."""
+        with self._cond:
+            return not self._ready and not self._in_flight and not self._can_submit()
+
+    def pop(self):
+        """Returns the next buffered (question, fingerprint) pair or None, and tops the buffer up."""
+        with self._cond:
+            q = self._ready.popleft() if self._ready else None
+            self._refill()
+            return q
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            # Cancelling runs _on_done right away, which removes the future from the set
+            for fut in list(self._in_flight):
+                fut.cancel()
+            self._ready.clear()
+            self._keys.clear()
+            self._cond.notify_all()
+
+    def _can_submit(self):
+        if self._stopped or self._failures >= self.max_failures:
+            return False
+        if self.max_total is not None and self._produced + len(self._in_flight) >= self.max_total:
+            return False
+        return True
+
+    def _refill(self):
+        with self._cond:
+            while len(self._ready) + len(self._in_flight) < self.capacity and self._can_submit():
+                fut = self.pool.submit(self._rng.choice(self.categories))
+                self._in_flight.add(fut)
+                fut.add_done_callback(self._on_done)
+
+    def _on_done(self, fut):
+        with self._cond:
+            self._in_flight.discard(fut)
+            if self._stopped or fut.cancelled():
+                self._cond.notify_all()
+                return
+
+            result = fut.result()
+            q_data, key = result if result is not None else (None, None)
+            if q_data is not None and len(q_data) == 3:
+                q_data = (q_data[0], q_data[1], q_data[2], "No explanation provided.")
+
+            if q_data is not None and key not in self._keys and key not in self.seen:
+                self._keys.add(key)
+                self._ready.append((q_data, key))
+                self._produced += 1
+                self._failures = 0
+            else:
+                self._failures += 1
+
+            self._refill()
+            self._cond.notify_all()
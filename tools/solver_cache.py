@@ -0,0 +1,87 @@
+import pickle
+
+from tools.sqlite_store import SQLiteLRUStore
+
+
+class SolverCache(SQLiteLRUStore):
+    """
+    On-disk LRU cache of solver results keyed by (solver, canonical instance key).
+
+    Shared by every generator process through one SQLite file, like the
+    QuestionCache, so a result computed by one worker is a lookup for the others
+    and survives worker restarts. Values are pickled, so exact fractions and
+    tuples come back unchanged. `solver` names the computation and should carry
+    a version (e.g. 'mnk-search/1'), so changing a solver never serves stale
+    results.
+
+    Hits, misses and evictions are counted per process and added to a shared
+    counters table along with the other pending writes (see SQLiteLRUStore), so
+    `stats()` reports the totals over all processes that flushed or closed
+    their cache.
+    """
+
+    TABLE = 'results'
+    KEY_COLUMNS = ('solver', 'key')
+    COUNTERS = ('hits', 'misses', 'evictions')
+
+    def __init__(self, path, max_entries=50000, evict_interval=64, flush_interval=64):
+        super().__init__(path, max_entries, evict_interval, flush_interval)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._unflushed = dict.fromkeys(self.COUNTERS, 0)
+
+    def _create_tables(self, conn):
+        super()._create_tables(conn)
+        conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.executemany("INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+                         [(name,) for name in self.COUNTERS])
+
+    def _write_pending(self, conn):
+        super()._write_pending(conn)
+        counts = [(amount, name) for name, amount in self._unflushed.items() if amount]
+        if counts:
+            conn.executemany("UPDATE counters SET value = value + ? WHERE name = ?", counts)
+            self._unflushed = dict.fromkeys(self.COUNTERS, 0)
+
+    def _discard_pending(self):
+        super()._discard_pending()
+        self._unflushed = dict.fromkeys(self.COUNTERS, 0)
+
+    def _count(self, name, amount=1):
+        setattr(self, name, getattr(self, name) + amount)
+        self._unflushed[name] += amount
+
+    def get(self, solver, key):
+        """The cached result, or None."""
+        with self._lock:
+            payload = self._read((solver, key))
+            self._count('misses' if payload is None else 'hits')
+        return None if payload is None else pickle.loads(payload)
+
+    def put(self, solver, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            evicted = self._write((solver, key), payload)
+            if evicted:
+                self._count('evictions', evicted)
+
+    def get_or_compute(self, solver, key, compute):
+        """Cached result of `compute()` for this instance, computing and storing it on a miss."""
+        value = self.get(solver, key)
+        if value is None:
+            value = compute()
+            self.put(solver, key, value)
+        return value
+
+    def stats(self):
+        """Totals over every process sharing the file, with this process's own counts under 'local'."""
+        with self._lock:
+            conn = self._connection()
+            self._flush(conn)
+            totals = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            totals['entries'] = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_rate'] = totals['hits'] / lookups if lookups else 0.0
+        totals['local'] = {name: getattr(self, name) for name in self.COUNTERS}
+        return totals
@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteLRUStore:
+    """
+    Base of the on-disk LRU caches: one SQLite table of rows
+    (KEY_COLUMNS..., payload, last_used), shared by several processes.
+
+    Each process opens its own connection lazily, in WAL mode so readers do not
+    block each other. When the table grows past `max_entries`, the least recently
+    used rows are evicted (the size is checked every `evict_interval` writes, so
+    COUNT(*) stays off the hot path).
+
+    Reads do not write: the last use of the rows that were hit is kept in memory
+    and written with the next write, or every `flush_interval` reads, so lookups
+    do not queue on SQLite's single write lock. Subclasses with more to write
+    after reads extend `_write_pending` and `_discard_pending`.
+    """
+
+    TABLE = None
+    KEY_COLUMNS = ()
+    PAYLOAD_TYPE = 'BLOB'
+
+    def __init__(self, path, max_entries, evict_interval=64, flush_interval=64):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_interval = evict_interval
+        self.flush_interval = flush_interval
+        self._writes = 0
+        self._reads = 0
+        self._touched = {}  # key -> last use not written yet
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+        where = " AND ".join(f"{column} = ?" for column in self.KEY_COLUMNS)
+        columns = ", ".join(self.KEY_COLUMNS)
+        self._select_sql = f"SELECT payload FROM {self.TABLE} WHERE {where}"
+        self._touch_sql = f"UPDATE {self.TABLE} SET last_used = ? WHERE {where}"
+        self._insert_sql = (f"INSERT OR REPLACE INTO {self.TABLE} ({columns}, payload, last_used) "
+                            f"VALUES ({', '.join('?' for _ in self.KEY_COLUMNS)}, ?, ?)")
+
+    def _connection(self):
+        # sqlite connections must not be shared across fork()
+        if self._conn is None or self._pid != os.getpid():
+            if self._pid != os.getpid():
+                # Whatever a parent process had not written yet is its own to write
+                self._discard_pending()
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._create_tables(self._conn)
+            self._pid = os.getpid()
+        return self._conn
+
+    def _create_tables(self, conn):
+        key_columns = "".join(f" {column} TEXT NOT NULL," for column in self.KEY_COLUMNS)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+            f"{key_columns}"
+            f" payload {self.PAYLOAD_TYPE} NOT NULL,"
+            f" last_used INTEGER NOT NULL,"
+            f" PRIMARY KEY ({', '.join(self.KEY_COLUMNS)}))"
+        )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_last_used ON {self.TABLE}(last_used)")
+
+    def _read(self, key):
+        """The payload stored under `key` (a tuple of key column values), or None. The caller holds the lock."""
+        conn = self._connection()
+        row = conn.execute(self._select_sql, key).fetchone()
+        if row is not None:
+            self._touched[key] = time.time_ns()
+        self._reads += 1
+        if self._reads % self.flush_interval == 0:
+            self._flush(conn)
+        return None if row is None else row[0]
+
+    def _write(self, key, payload):
+        """Stores `payload` under `key`; returns the number of rows evicted. The caller holds the lock."""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            self._touched.pop(key, None)
+            self._write_pending(conn)
+            conn.execute(self._insert_sql, key + (payload, time.time_ns()))
+
+            self._writes += 1
+            if self._writes % self.evict_interval != 0:
+                return 0
+
+            count = conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+            if count <= self.max_entries:
+                return 0
+            return conn.execute(
+                f"DELETE FROM {self.TABLE} WHERE rowid IN "
+                f"(SELECT rowid FROM {self.TABLE} ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            ).rowcount
+
+    def _flush(self, conn):
+        with conn:
+            conn.execute("BEGIN")
+            self._write_pending(conn)
+
+    def _write_pending(self, conn):
+        if self._touched:
+            conn.executemany(self._touch_sql, [(used,) + key for key, used in self._touched.items()])
+            self._touched.clear()
+
+    def _discard_pending(self):
+        self._touched.clear()
+
+    def flush(self):
+        """Writes what this process has not written yet (done on every write and on close)."""
+        with self._lock:
+            self._flush(self._connection())
+
+    def __len__(self):
+        with self._lock:
+            return self._connection().execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._flush(self._conn)
+                self._conn.close()
+            self._conn = None